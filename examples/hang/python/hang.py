@@ -1,13 +1,11 @@
-import time
+import threading
 
 
 def spin_forever() -> None:
-    counter = 0
-    while True:
-        counter += 1
-        if counter % 5_000_000 == 0:
-            print(f"still spinning... {counter}")
-        time.sleep(0.1)
+    # Blocks on an Event nobody sets: hung from the debugger's point of view,
+    # without waking the interpreter (or the CPU) on a timer.
+    print("waiting forever...")
+    threading.Event().wait()
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
+from functools import lru_cache
 import textwrap
 
 from dbgcopilot.llm import providers as provider_registry
@@ -14,7 +15,8 @@ from dbgcopilot.utils.tools import warn_missing_debugger_tools
 from .runner import AgentRequest, DebugAgentRunner
 
 
-SUPPORTED_DEBUGGERS = [
+# Ordered for argparse's --help listing.
+SUPPORTED_DEBUGGERS = (
     "gdb",
     "rust-gdb",
     "lldb",
@@ -24,16 +26,30 @@ SUPPORTED_DEBUGGERS = [
     "pdb",
     "delve",
     "radare2",
-]
-
-
-def _default_path(prefix: str, suffix: str) -> Path:
-    ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+)
+# Debuggers that cannot start without --program.
+_PROGRAM_REQUIRED_DEBUGGERS = frozenset({"delve", "radare2", "pdb", "rust-lldb", "lldb-rust"})
+# Executable each debugger needs on PATH (pdb runs in-process, so none).
+_DEBUGGER_TOOLS = {
+    "gdb": ("gdb",),
+    "rust-gdb": ("gdb",),
+    "lldb": ("lldb",),
+    "rust-lldb": ("lldb",),
+    "lldb-rust": ("lldb",),
+    "jdb": ("jdb",),
+    "pdb": (),
+    "delve": ("dlv",),
+    "radare2": ("radare2",),
+}
+
+
+def _default_path(prefix: str, suffix: str, ts: str) -> Path:
     return Path("/tmp") / f"{prefix}-{ts}{suffix}"
 
 
-def build_parser() -> argparse.ArgumentParser:
-    provider_choices = provider_registry.list_providers()
+def build_parser(provider_choices: list[str] | None = None) -> argparse.ArgumentParser:
+    if provider_choices is None:
+        provider_choices = provider_registry.list_providers()
     default_provider = "openrouter"
     if provider_choices:
         if default_provider not in provider_choices:
@@ -97,6 +113,12 @@ def build_parser() -> argparse.ArgumentParser:
         help="Main class for jdb (fully qualified, e.g. com.example.Main)",
     )
     parser.add_argument("--max-steps", type=int, default=16, help="Maximum auto iterations")
+    parser.add_argument(
+        "--max-probes",
+        type=int,
+        default=1,
+        help="Let the LLM request up to N independent probe commands per step (crash/hang/leak goals only)",
+    )
     parser.add_argument(
         "--language",
         default="en",
@@ -110,16 +132,32 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--log-file", default=None, help="Explicit log file path (implies --log-session)")
     parser.add_argument("--report-file", default=None, help="Where to write the final report (defaults to /tmp)")
     parser.add_argument("--resume-from", default=None, help="Existing report/notes to inject as additional context")
+    parser.add_argument(
+        "--llm-cache",
+        default=None,
+        help="SQLite file caching LLM responses; identical prompts are answered from it (default: disabled)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream LLM replies and stop generation once the requested command(s) have been emitted",
+    )
     return parser
 
 
+@lru_cache(maxsize=1)
+def _parser_for(providers: tuple[str, ...]) -> argparse.ArgumentParser:
+    # Keyed on the provider list so a registry change still yields fresh choices.
+    return build_parser(list(providers))
+
+
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    parser = _parser_for(tuple(provider_registry.list_providers()))
     args = parser.parse_args(argv)
 
-    warn_missing_debugger_tools("dbgagent")
-
     debugger = args.debugger
+    # Only the selected debugger's binary matters for this run.
+    warn_missing_debugger_tools("dbgagent", _DEBUGGER_TOOLS.get(debugger, ()))
 
     if debugger == "jdb":
         if args.program:
@@ -129,14 +167,16 @@ def main(argv: list[str] | None = None) -> int:
         if not args.main_class:
             parser.error("jdb debugger requires --main-class (fully qualified entry point)")
     else:
-        if debugger in {"delve", "radare2", "pdb", "rust-lldb", "lldb-rust"} and not args.program:
+        if debugger in _PROGRAM_REQUIRED_DEBUGGERS and not args.program:
             parser.error(f"{debugger} debugger requires --program")
 
     log_enabled = bool(args.log_session or args.log_file or os.getenv("DBGAGENT_LOG"))
-    report_path = Path(args.report_file) if args.report_file else _default_path("dbgagent-report", ".md")
+    # One stamp for every default path, so a run's report and log names match.
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    report_path = Path(args.report_file) if args.report_file else _default_path("dbgagent-report", ".md", ts)
     log_path: Path | None
     if log_enabled:
-        log_path = Path(args.log_file) if args.log_file else _default_path("dbgagent", ".log")
+        log_path = Path(args.log_file) if args.log_file else _default_path("dbgagent", ".log", ts)
     else:
         log_path = None
 
@@ -145,7 +185,10 @@ def main(argv: list[str] | None = None) -> int:
         resume_path = Path(args.resume_from)
         if not resume_path.is_file():
             parser.error(f"Resume file not found: {resume_path}")
-        resume_text = resume_path.read_text(encoding="utf-8")
+        # One read and one decode; newlines are normalized as read_text() would.
+        resume_text = resume_path.read_bytes().decode("utf-8")
+        if "\r" in resume_text:
+            resume_text = resume_text.replace("\r\n", "\n").replace("\r", "\n")
 
     request = AgentRequest(
         debugger=debugger,
@@ -165,6 +208,9 @@ def main(argv: list[str] | None = None) -> int:
         log_enabled=log_enabled,
         log_path=log_path,
         report_path=report_path,
+        llm_cache_path=Path(args.llm_cache) if args.llm_cache else None,
+        max_probes=args.max_probes,
+        stream=args.stream,
     )
 
     runner = DebugAgentRunner(request)
@@ -1,6 +1,8 @@
 """Prompt defaults for dbgagent autonomous runs."""
 from __future__ import annotations
 
+from functools import lru_cache
+
 AGENT_PROMPT_CONFIG: dict[str, object] = {
     "system_preamble": (
         "You are dbgagent, an autonomous debugging assistant operating inside {debugger}.\n"
@@ -25,4 +27,35 @@ AGENT_PROMPT_CONFIG: dict[str, object] = {
         "If you can conclude, output the Final Report using the mandated headings."
     ),
     "max_steps": 16,
+    "batch_instruction": (
+        "Batch mode: each turn you may request up to {max_probes} independent probe commands instead of one.\n"
+        "Put each in its own tag numbered from 1, e.g. <cmd index=\"1\">info registers</cmd> <cmd index=\"2\">bt</cmd>.\n"
+        "Only batch probes whose results do not depend on each other (never a command that resumes or changes "
+        "program state together with others); otherwise use a single <cmd>.\n"
+        "Outputs come back labelled [1]..[{max_probes}] in the order you numbered them."
+    ),
+    "facts_summary_instruction": (
+        "Condense the following debugger observations into at most 6 short bullet points. "
+        "Keep addresses, signal names, function names and values that may matter later; drop repetition."
+    ),
 }
+
+
+@lru_cache(maxsize=8)
+def build_system_prompt(debugger: str, template: str, rules: tuple[str, ...]) -> str:
+    """Render the system preamble for ``debugger`` followed by the bulleted rules.
+
+    Memoized: the result only depends on the debugger and the (immutable)
+    prompt text, so every run against the same debugger reuses one string.
+    """
+    try:
+        preamble = template.format(debugger=debugger)
+    except Exception:
+        preamble = template
+    rules_text = "\n".join(f"- {rule}" for rule in rules)
+    return "\n\n".join(part for part in (preamble, ("Rules:\n" + rules_text) if rules_text else "") if part)
+
+
+# Goal categories whose probes are usually independent reads of a stopped
+# program, so they may be batched. Custom goals always run one command per turn.
+PARALLEL_PROBE_GOALS = frozenset({"crash", "hang", "leak"})
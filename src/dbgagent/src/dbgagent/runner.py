@@ -1,18 +1,87 @@
 """Core execution loop for dbgagent."""
 from __future__ import annotations
 
+from collections import Counter, deque
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable, cast, Iterable
+from typing import Optional, Dict, Any, Callable, Deque, Iterator, TextIO, cast, Iterable
+import json
 import logging
-import uuid
+import logging.handlers
+import os
+import queue
 import re
+import time
 
-from dbgcopilot.core.state import Attempt
+from dbgcopilot.core.state import Attempt, intern_snippet
 from dbgcopilot.utils.io import head_tail_truncate, strip_ansi
 from dbgcopilot.llm import providers
-
-from .prompts import AGENT_PROMPT_CONFIG
+from dbgcopilot.llm.cache import ExactCache, cached_call
+
+from .prompts import AGENT_PROMPT_CONFIG, PARALLEL_PROBE_GOALS, build_system_prompt
+
+
+_CMD_RE = re.compile(r"<cmd(?:\s+index\s*=\s*[\"']?(\d+)[\"']?)?\s*>\s*([\s\S]*?)\s*</cmd>", re.IGNORECASE)
+_CHATLOG_LIMIT = 128
+_FACTS_LIMIT = 128
+_ATTEMPTS_LIMIT = 128
+# Facts kept verbatim; at the start of a step any excess, plus this many more
+# of the oldest, is folded into the rolling summary.
+_FACTS_COMPACT_BATCH = 32
+_FACTS_SUMMARY_MAX = 4000
+_SNIPPET_LEN = 160
+# Debugger output kept between steps; the prompt shows a shorter slice of it.
+_LAST_OUTPUT_MAX = 4000
+# cached_tokens is the part of prompt_tokens served from the provider's prefix cache.
+_USAGE_TOKEN_KEYS = ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens")
+
+_LANGUAGE_INSTRUCTIONS: dict[str, str] = {
+    **dict.fromkeys(
+        ("en", "en-us", "en-gb", "english"),
+        "Respond in English. Do not switch languages unless explicitly requested.",
+    ),
+    **dict.fromkeys(
+        ("zh", "zh-cn", "zh-hans", "chinese"),
+        "请使用简体中文回答，并且仅在收到明确指示时切换语言。",
+    ),
+}
+
+
+@lru_cache(maxsize=32)
+def _build_provider_fn(provider: str, session_config_items: tuple[tuple[str, str], ...]) -> Callable[[str], str]:
+    """Create the provider callable once per (provider, config) for the whole process.
+
+    Sessions with the same configuration share the callable and therefore its
+    HTTP connection pool.
+    """
+    session_config = dict(session_config_items)
+    if provider == "openrouter":
+        from dbgcopilot.llm import openrouter as _or
+
+        return _or.create_provider(session_config=session_config)
+    if provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "llama-cpp", "modelscope"}:
+        from dbgcopilot.llm import openai_compat as _oa
+
+        return _oa.create_provider(session_config=session_config, name=provider)
+    prov = providers.get_provider(provider)
+    if prov is None:
+        raise RuntimeError(f"Unknown provider: {provider}")
+    return prov.ask
+
+
+# Winning LLDB backend class per flavour ("lldb", "lldb-rust"), probed once per
+# process so later sessions skip the failed imports of the fallback chain.
+_LLDB_BACKEND_CLS: dict[str, type] = {}
+
+
+def _format_usage_entry(entry: Dict[str, Any]) -> str:
+    parts = [f"provider={entry['provider']}", f"model={entry['model']}"]
+    parts += [f"{key}={entry[key]}" for key in _USAGE_TOKEN_KEYS if key in entry]
+    if "cost" in entry:
+        parts.append(f"cost=${entry['cost']:.6f}")
+    return ", ".join(parts)
 
 
 @dataclass
@@ -34,15 +103,22 @@ class AgentRequest:
     log_enabled: bool
     log_path: Optional[Path]
     report_path: Path
+    llm_cache_path: Optional[Path] = None
+    max_probes: int = 1
+    stream: bool = False
 
 
 @dataclass
 class AgentState:
     session_id: str
-    attempts: list[Attempt] = field(default_factory=list)
-    chatlog: list[str] = field(default_factory=list)
-    facts: list[str] = field(default_factory=list)
+    attempts: Deque[Attempt] = field(default_factory=lambda: deque(maxlen=_ATTEMPTS_LIMIT))
+    # (role, payload...) tuples; join lazily if a transcript is ever needed.
+    chatlog: Deque[tuple[str, ...]] = field(default_factory=lambda: deque(maxlen=_CHATLOG_LIMIT))
+    # Unbounded between steps; _compact_facts trims it back below _FACTS_LIMIT.
+    facts: Deque[str] = field(default_factory=deque)
     last_output: str = ""
+    # Rolling LLM summary of facts evicted from the bounded buffer.
+    facts_summary: str = ""
 
 
 class DebugAgentRunner:
@@ -50,31 +126,53 @@ class DebugAgentRunner:
 
     def __init__(self, request: AgentRequest) -> None:
         self.request = request
-        self.state = AgentState(session_id=str(uuid.uuid4())[:8])
+        self.state = AgentState(session_id=os.urandom(4).hex())
         self.prompt_config: Dict[str, Any] = dict(AGENT_PROMPT_CONFIG)
         self.session_config: dict[str, str] = {}
         self.logger = logging.getLogger(f"dbgagent.session.{self.state.session_id}")
         self.logger.setLevel(logging.INFO)
         self._handler: Optional[logging.Handler] = None
+        self._file_handler: Optional[logging.Handler] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._attempts_fp: Optional[TextIO] = None
+        self._usage_fp: Optional[TextIO] = None
         self._provider_cache: Dict[str, Callable[[str], str]] = {}
+        # (source, truncated) for the last truncated debugger output.
+        self._trunc_cache: Optional[tuple[str, str]] = None
         self.usage_entries: list[Dict[str, Any]] = []
-        self.usage_totals: Dict[str, float] = {
-            "prompt_tokens": 0.0,
-            "completion_tokens": 0.0,
-            "total_tokens": 0.0,
-            "cost": 0.0,
-        }
+        # All attempts recorded, including those rotated out of state.attempts.
+        self._attempts_total = 0
+        # Token counts stay ints; "cost" accumulates as a float.
+        self.usage_totals: Counter[str] = Counter(cost=0.0)
         if self.request.log_enabled and self.request.log_path is not None:
             self.request.log_path.parent.mkdir(parents=True, exist_ok=True)
-            handler = logging.FileHandler(self.request.log_path, encoding="utf-8")
-            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            file_handler = logging.FileHandler(self.request.log_path, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            # The agent loop only enqueues records; a listener thread does the disk I/O.
+            log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+            handler = logging.handlers.QueueHandler(log_queue)
+            self._listener = logging.handlers.QueueListener(log_queue, file_handler)
+            self._listener.start()
             self.logger.addHandler(handler)
             self._handler = handler
+            self._file_handler = file_handler
+        # Callers check this before formatting large messages (LLM replies, outputs).
+        self._log_on = bool(self.request.log_enabled and self._handler is not None)
+        self._resume_stripped = (self.request.resume_context or "").strip()
+        self._cached_prefix: Optional[str] = None
+        # Number of probe commands the LLM may batch per turn (1 = classic loop).
+        self._max_probes = max(1, int(self.request.max_probes or 1))
+        if self.request.goal_type not in PARALLEL_PROBE_GOALS:
+            self._max_probes = 1
+        self._llm_cache: Optional[ExactCache] = None
+        if self.request.llm_cache_path is not None:
+            self._llm_cache = ExactCache(self.request.llm_cache_path)
         # Seed context from resume file if provided
-        if self.request.resume_context:
-            self.state.facts.append("Prior session summary:")
-            for line in self.request.resume_context.strip().splitlines():
-                self.state.facts.append(f"  {line.strip()}")
+        if self._resume_stripped:
+            facts = self.state.facts
+            facts.append("Prior session summary:")
+            # Blank lines would only pad the observations block.
+            facts.extend(f"  {line}" for line in map(str.strip, self._resume_stripped.splitlines()) if line)
 
         # Prepare provider-specific configuration
         provider_key = self.request.provider.replace("-", "_")
@@ -100,6 +198,7 @@ class DebugAgentRunner:
     # ------------------------------------------------------------------
     def run(self) -> str:
         try:
+            self._open_journals()
             self._log(f"Starting dbgagent session {self.state.session_id}")
             self._log(f"Debugger: {self.request.debugger}")
             self._log(f"Provider: {self.request.provider} | Model: {self.request.model or '(default)'}")
@@ -117,13 +216,45 @@ class DebugAgentRunner:
                     self._log(f"Corefile: {self.request.corefile}")
             self.backend = self._create_backend()
             self._prepare_debugger()
+            self._cached_prefix = self._build_static_prefix()
             final_report = self._auto_loop()
             self._write_report(final_report)
             return final_report
         finally:
+            self._log_on = False
             if self._handler is not None:
                 self.logger.removeHandler(self._handler)
                 self._handler.close()
+            if self._listener is not None:
+                # Drains queued records into the file handler before returning.
+                self._listener.stop()
+                self._listener = None
+            if self._file_handler is not None:
+                self._file_handler.close()
+            for fp in (self._attempts_fp, self._usage_fp):
+                if fp is not None:
+                    fp.close()
+            self._attempts_fp = self._usage_fp = None
+            if self._llm_cache is not None:
+                self._llm_cache.close()
+                self._llm_cache = None
+
+    def _open_journals(self) -> None:
+        """Open the per-session JSONL journals kept next to the report.
+
+        Attempts and usage entries are appended as they happen so a crashed run
+        still leaves a record behind; the in-memory copies feed the final report.
+        Files are line-buffered so every record reaches disk when written, and
+        each record carries the session id and a timestamp so runs that share a
+        report path can be told apart.
+        """
+        report_path = self.request.report_path
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        self._attempts_fp = report_path.with_suffix(".attempts.jsonl").open("a", encoding="utf-8", buffering=1)
+        self._usage_fp = report_path.with_suffix(".usage.jsonl").open("a", encoding="utf-8", buffering=1)
+
+    def _journal(self, fp: TextIO, record: Dict[str, Any]) -> None:
+        fp.write(json.dumps({"session": self.state.session_id, "ts": round(time.time(), 3), **record}) + "\n")
 
     # ------------------------------------------------------------------
     def _create_backend(self):
@@ -185,13 +316,31 @@ class DebugAgentRunner:
 
         return backend
 
+    def _cached_lldb_backend(self, flavour: str):
+        cls = _LLDB_BACKEND_CLS.get(flavour)
+        if cls is None:
+            return None
+        try:
+            backend = cls()
+            backend.initialize_session()
+        except Exception as exc:
+            _LLDB_BACKEND_CLS.pop(flavour, None)
+            self._log(f"Cached LLDB backend {cls.__name__} failed, probing again: {exc}")
+            return None
+        self._log(f"Selected cached LLDB backend: {cls.__name__}")
+        return backend
+
     def _create_lldb_backend(self):
+        backend = self._cached_lldb_backend("lldb")
+        if backend is not None:
+            return backend
         api_error: Optional[Exception] = None
         try:
             from dbgcopilot.backends.lldb_api import LldbApiBackend
 
             backend = LldbApiBackend()
             backend.initialize_session()
+            _LLDB_BACKEND_CLS["lldb"] = LldbApiBackend
             self._log("Selected LLDB API backend")
             return backend
         except Exception as exc:
@@ -205,6 +354,7 @@ class DebugAgentRunner:
 
                 backend = LldbInProcessBackend()
                 backend.initialize_session()
+                _LLDB_BACKEND_CLS["lldb"] = LldbInProcessBackend
                 self._log("Selected LLDB in-process backend")
                 return backend
         except Exception:
@@ -214,6 +364,7 @@ class DebugAgentRunner:
 
         backend = LldbSubprocessBackend()
         backend.initialize_session()
+        _LLDB_BACKEND_CLS["lldb"] = LldbSubprocessBackend
         if api_error:
             self._log(f"LLDB API backend unavailable, using subprocess backend: {api_error}")
         else:
@@ -221,12 +372,16 @@ class DebugAgentRunner:
         return backend
 
     def _create_lldb_rust_backend(self):
+        backend = self._cached_lldb_backend("lldb-rust")
+        if backend is not None:
+            return backend
         api_error: Optional[Exception] = None
         try:
             from dbgcopilot.backends.lldb_rust_api import LldbRustApiBackend
 
             backend = LldbRustApiBackend()
             backend.initialize_session()
+            _LLDB_BACKEND_CLS["lldb-rust"] = LldbRustApiBackend
             self._log("Selected LLDB Rust API backend")
             return backend
         except Exception as exc:
@@ -236,6 +391,7 @@ class DebugAgentRunner:
 
         backend = LldbRustBackend()
         backend.initialize_session()
+        _LLDB_BACKEND_CLS["lldb-rust"] = LldbRustBackend
         if api_error:
             self._log(
                 f"LLDB Rust API backend unavailable, using subprocess backend: {api_error}"
@@ -295,38 +451,33 @@ class DebugAgentRunner:
         except Exception:
             max_steps = self.request.max_steps
 
-        dbg = getattr(self.backend, "name", self.request.debugger)
-        system_template = str(self.prompt_config.get("system_preamble", ""))
-        try:
-            system_preamble = system_template.format(debugger=dbg)
-        except Exception:
-            system_preamble = system_template
-
-        rules_value = self.prompt_config.get("rules", [])
-        if isinstance(rules_value, (list, tuple)):
-            iterable_rules = cast(Iterable[Any], rules_value)
-            rendered_rules = [f"- {item}" for item in iterable_rules]
-            rules_text = "\n".join(rendered_rules)
-        else:
-            rules_text = ""
-
         followup = str(self.prompt_config.get("followup_instruction", ""))
-        language_instruction = self._language_instruction()
+        if self._cached_prefix is None:
+            self._cached_prefix = self._build_static_prefix()
+        # The closing turn markers never change either; render them once.
+        prompt_tail = "\n\nUser: " + followup + "\n\nAssistant:"
 
         for step in range(1, max_steps + 1):
-            prompt = self._build_prompt(system_preamble, rules_text, followup, language_instruction)
-            answer = self._call_llm(prompt)
+            if len(self.state.facts) > _FACTS_LIMIT:
+                self._compact_facts()
+            prefix, suffix = self._build_prompt(prompt_tail)
+            answer = self._call_llm(prefix + suffix)
             answer_clean = answer.strip()
-            self._log(f"LLM step {step} response:\n{answer_clean}")
-            self.state.chatlog.append(f"Assistant: {answer_clean}")
-
-            cmd = self._extract_cmd(answer_clean)
-            if cmd:
-                self._log(f"Executing command: {cmd}")
-                if self.backend is None:
-                    raise RuntimeError("Debugger backend not initialized")
-                out = self.backend.run_command(cmd)
-                self._record_execution(cmd, out)
+            if self._log_on:
+                self._log(f"LLM step {step} response:\n{answer_clean}")
+            self.state.chatlog.append(("assistant", answer_clean))
+
+            cmds = self._extract_cmds(answer_clean, self._max_probes)
+            if cmds:
+                outputs: list[str] = []
+                for cmd, out in zip(cmds, self._run_probes(cmds)):
+                    self._record_execution(cmd, out)
+                    outputs.append(self.state.last_output)
+                if len(cmds) > 1:
+                    self.state.last_output = "\n".join(
+                        f"[{idx}] {cmd}\n{out or '(no output)'}"
+                        for idx, (cmd, out) in enumerate(zip(cmds, outputs), start=1)
+                    )
                 continue
 
             if not answer_clean:
@@ -338,80 +489,173 @@ class DebugAgentRunner:
         self._log("Reached maximum iterations without final report")
         return self._fallback_report()
 
+    def _run_probes(self, cmds: list[str]) -> list[str]:
+        """Run a batch of probe commands and return their raw outputs in order.
+
+        Every backend drives a single debugger process, so the batch runs one
+        command after another; batching saves LLM round trips, not debugger time.
+        """
+        backend = self.backend
+        if backend is None:
+            raise RuntimeError("Debugger backend not initialized")
+        outputs: list[str] = []
+        for cmd in cmds:
+            self._log(f"Executing command: {cmd}")
+            outputs.append(backend.run_command(cmd))
+        return outputs
+
     # ------------------------------------------------------------------
-    def _build_prompt(self, system_preamble: str, rules_text: str, followup: str, language_instruction: str) -> str:
-        context_lines: list[str] = []
-        context_lines.append(f"Goal category: {self.request.goal_type}")
+    def _build_static_prefix(self) -> str:
+        """Render the part of the prompt that stays fixed for the whole run.
+
+        This covers the system preamble, rules, language instruction and the
+        invariant head of the Context block (goal and resumed report). Keeping
+        it as the literal leading text of every prompt lets providers with
+        automatic prefix caching reuse it across steps.
+        """
+        dbg = getattr(self.backend, "name", self.request.debugger)
+        rules_value = self.prompt_config.get("rules", [])
+        rules: tuple[str, ...] = ()
+        if isinstance(rules_value, (list, tuple)):
+            rules = tuple(str(item) for item in cast(Iterable[Any], rules_value))
+        system_prompt = build_system_prompt(str(dbg), str(self.prompt_config.get("system_preamble", "")), rules)
+
+        language_instruction = self._language_instruction()
+        batch_instruction = ""
+        if self._max_probes > 1:
+            batch_template = str(self.prompt_config.get("batch_instruction", ""))
+            try:
+                batch_instruction = batch_template.format(max_probes=self._max_probes)
+            except Exception:
+                batch_instruction = batch_template
+        head = "\n\n".join(
+            part
+            for part in (
+                system_prompt,
+                batch_instruction,
+                language_instruction,
+            )
+            if part
+        )
+
+        context_head = [f"Goal category: {self.request.goal_type}"]
         if self.request.goal_text:
-            context_lines.append(f"Goal notes: {self.request.goal_text}")
-        if self.request.resume_context:
-            context_lines.append("Loaded prior report:")
-            context_lines.append(self.request.resume_context.strip())
-        if self.state.facts:
-            context_lines.append("Recent observations:")
-            context_lines.extend(self.state.facts[-10:])
-        if self.state.attempts:
-            recent_cmds = [f"- {a.cmd}: {a.output_snippet[:160]}" for a in self.state.attempts[-5:]]
-            context_lines.append("Recent commands:")
-            context_lines.extend(recent_cmds)
+            context_head.append(f"Goal notes: {self.request.goal_text}")
+        if self._resume_stripped:
+            context_head.append("Loaded prior report:\n" + self._resume_stripped)
+        return head + "\n\nContext:\n" + "\n".join(context_head)
+
+    def _build_prompt(self, prompt_tail: str) -> tuple[str, str]:
+        """Return ``(prefix, suffix)``; the prefix is identical on every step.
+
+        Only the per-step observations are rendered here; ``prompt_tail`` is the
+        pre-rendered ``User:``/``Assistant:`` ending.
+        """
+        sections: list[str] = []
+        facts = self.state.facts
+        attempts = self.state.attempts
+        if self.state.facts_summary:
+            sections.append("Earlier observations (summarized):\n" + self.state.facts_summary)
+        if facts:
+            sections.append("Recent observations:\n" + "\n".join(islice(facts, max(0, len(facts) - 10), None)))
+        if attempts:
+            sections.append(
+                "Recent commands:\n"
+                + "\n".join(
+                    f"- {a.cmd}: {a.output_snippet}" for a in islice(attempts, max(0, len(attempts) - 5), None)
+                )
+            )
         if self.state.last_output:
-            context_lines.append("Latest debugger output:")
-            context_lines.append(head_tail_truncate(self.state.last_output, 1200))
-
-        context_block = "\n".join(context_lines)
-        prompt_parts = [system_preamble]
-        if rules_text:
-            prompt_parts.append("Rules:\n" + rules_text)
-        if language_instruction:
-            prompt_parts.append(language_instruction)
-        if context_block:
-            prompt_parts.append("Context:\n" + context_block)
-        prompt_parts.append("User: " + followup)
-        prompt_parts.append("Assistant:")
-        return "\n\n".join(prompt_parts)
+            sections.append("Latest debugger output:\n" + self._truncated_last_output())
+
+        return self._cached_prefix or "", "".join("\n" + section for section in sections) + prompt_tail
+
+    def _truncated_last_output(self) -> str:
+        last_output = self.state.last_output
+        cached = self._trunc_cache
+        if cached is not None and cached[0] is last_output:
+            return cached[1]
+        truncated = head_tail_truncate(last_output, 1200)
+        self._trunc_cache = (last_output, truncated)
+        return truncated
 
     def _language_instruction(self) -> str:
         lang = (self.request.language or "en").lower()
-        if lang in {"en", "en-us", "en-gb", "english"}:
-            return "Respond in English. Do not switch languages unless explicitly requested."
-        if lang in {"zh", "zh-cn", "zh-hans", "chinese", "zh-cn"}:
-            return "请使用简体中文回答，并且仅在收到明确指示时切换语言。"
+        instruction = _LANGUAGE_INSTRUCTIONS.get(lang)
+        if instruction is not None:
+            return instruction
         return f"Respond in {self.request.language}. Do not switch languages unless explicitly requested."
 
     # ------------------------------------------------------------------
     def _call_llm(self, prompt: str) -> str:
         provider = self.request.provider
         ask_fn = self._get_provider_fn(provider)
-        answer = ask_fn(prompt)
+        stream_fn = getattr(ask_fn, "stream", None) if self.request.stream else None
+        if stream_fn is not None:
+            answer = self._consume_stream(stream_fn(prompt))
+        else:
+            answer = ask_fn(prompt)
         usage = getattr(ask_fn, "last_usage", None)
         self._record_usage_stats(provider, usage)
         return answer
 
+    def _consume_stream(self, chunks: Iterator[str]) -> str:
+        """Collect a streamed reply, stopping once it holds ``max_probes`` closed ``<cmd>`` tags.
+
+        Closing the iterator drops the HTTP stream, so the provider stops
+        generating whatever the model would have written after the command.
+        """
+        parts: list[str] = []
+        closed = 0
+        tail = ""
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                # Keep 5 chars of the previous text so a tag split across chunks
+                # is still seen, without counting a complete earlier tag twice.
+                window = tail + chunk
+                closed += window.lower().count("</cmd>")
+                tail = window[-5:]
+                if closed >= self._max_probes:
+                    break
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        return "".join(parts)
+
     # ------------------------------------------------------------------
-    def _extract_cmd(self, text: str) -> Optional[str]:
-        match = re.search(r"<cmd>\s*([\s\S]*?)\s*</cmd>", text, re.IGNORECASE)
-        if not match:
-            return None
-        return match.group(1).strip()
+    def _extract_cmds(self, text: str, limit: int = 1) -> list[str]:
+        """Return up to ``limit`` commands from ``<cmd>`` tags, ordered by index.
+
+        Untagged ``<cmd>`` blocks keep their position in the reply; numbered
+        ``<cmd index="i">`` blocks are sorted by ``i``; empty blocks are skipped.
+        With ``limit`` 1 only the first block counts, as in the single-command
+        loop: an empty one yields no command.
+        """
+        if limit == 1:
+            match = _CMD_RE.search(text)
+            cmd = match.group(2).strip() if match else ""
+            return [cmd] if cmd else []
+        found: list[tuple[int, int, str]] = []
+        for pos, match in enumerate(_CMD_RE.finditer(text)):
+            cmd = match.group(2).strip()
+            if not cmd:
+                continue
+            index = int(match.group(1)) if match.group(1) else pos + 1
+            found.append((index, pos, cmd))
+        found.sort()
+        return [cmd for _, _, cmd in found[:limit]]
 
     def _get_provider_fn(self, provider: str) -> Callable[[str], str]:
         if provider in self._provider_cache:
             return self._provider_cache[provider]
 
-        if provider == "openrouter":
-            from dbgcopilot.llm import openrouter as _or
-
-            ask_fn = _or.create_provider(session_config=self.session_config)
-        elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "llama-cpp", "modelscope"}:
-            from dbgcopilot.llm import openai_compat as _oa
-
-            ask_fn = _oa.create_provider(session_config=self.session_config, name=provider)
-        else:
-            prov = providers.get_provider(provider)
-            if prov is None:
-                raise RuntimeError(f"Unknown provider: {provider}")
-            ask_fn = prov.ask
-
+        ask_fn = _build_provider_fn(provider, tuple(sorted(self.session_config.items())))
+        if self._llm_cache is not None:
+            ask_fn = cached_call(
+                ask_fn, self._llm_cache, provider, self.request.model or "(default)", self.session_config
+            )
         self._provider_cache[provider] = ask_fn
         return ask_fn
 
@@ -420,57 +664,103 @@ class DebugAgentRunner:
             return
 
         usage_dict: Dict[str, Any] = cast(Dict[str, Any], usage)
+        if usage_dict.get("cache_hit"):
+            self._log("LLM response served from cache")
 
         entry: Dict[str, Any] = {
             "provider": usage_dict.get("provider") or provider,
             "model": usage_dict.get("model") or self.request.model or "(default)",
         }
 
-        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        tokens: Dict[str, int] = {}
+        for key in _USAGE_TOKEN_KEYS:
             val = usage_dict.get(key)
             if val is None:
                 continue
-            try:
-                intval = int(val)
-            except Exception:
-                continue
-            entry[key] = intval
-            self.usage_totals[key] = self.usage_totals.get(key, 0.0) + intval
+            # Providers already return ints; only coerce strings and the like.
+            if not isinstance(val, int):
+                try:
+                    val = int(val)
+                except Exception:
+                    continue
+            tokens[key] = val
+        entry.update(tokens)
+        self.usage_totals.update(tokens)
 
         cost_val = usage_dict.get("cost")
         if cost_val is not None:
             try:
-                cost_float = float(cost_val)
-                entry["cost"] = cost_float
-                self.usage_totals["cost"] = self.usage_totals.get("cost", 0.0) + cost_float
+                cost_float = cost_val if isinstance(cost_val, float) else float(cost_val)
             except Exception:
                 pass
+            else:
+                entry["cost"] = cost_float
+                self.usage_totals["cost"] += cost_float
 
         self.usage_entries.append(entry)
+        if self._usage_fp is not None:
+            self._journal(self._usage_fp, entry)
 
-        msg_parts = [f"provider={entry['provider']}", f"model={entry['model']}"]
-        if "prompt_tokens" in entry:
-            msg_parts.append(f"prompt_tokens={entry['prompt_tokens']}")
-        if "completion_tokens" in entry:
-            msg_parts.append(f"completion_tokens={entry['completion_tokens']}")
-        if "total_tokens" in entry:
-            msg_parts.append(f"total_tokens={entry['total_tokens']}")
-        if "cost" in entry:
-            msg_parts.append(f"cost=${entry['cost']:.6f}")
-        self._log("LLM usage: " + ", ".join(msg_parts))
+        if not self._log_on:
+            return
+        self._log("LLM usage: " + _format_usage_entry(entry))
 
     def _record_execution(self, cmd: str, output: str) -> None:
-        clean_output = strip_ansi(output or "")
-        snippet = clean_output[:160]
-        self.state.attempts.append(Attempt(cmd=cmd, output_snippet=snippet))
-        self.state.last_output = clean_output
+        if not output:
+            # Setup commands (file, core-file, ...) often print nothing.
+            self._record_attempt(cmd, "")
+            self.state.last_output = ""
+            self.state.facts.append(f"Executed {cmd!r}: (no output)")
+            self.state.chatlog.append(("exec", cmd, ""))
+            self._log("Output:\n(no output)")
+            return
+        clean_output = strip_ansi(output)
+        self._record_attempt(cmd, clean_output[:_SNIPPET_LEN])
+        # Large dumps (disassemble, memory reads) are clamped once here rather than
+        # being retained whole and re-truncated by every prompt build.
+        kept_output = head_tail_truncate(clean_output, _LAST_OUTPUT_MAX)
+        self.state.last_output = kept_output
         if clean_output:
-            first_line = clean_output.splitlines()[0]
+            nl = clean_output.find("\n")
+            first_line = clean_output if nl == -1 else clean_output[:nl].rstrip("\r")
         else:
             first_line = "(no output)"
         self.state.facts.append(f"Executed {cmd!r}: {first_line}")
-        self.state.chatlog.append(f"Assistant: (executed) {cmd}\n" + clean_output)
-        self._log(f"Output:\n{clean_output.strip() if clean_output else '(no output)'}")
+        self.state.chatlog.append(("exec", cmd, kept_output))
+        if self._log_on:
+            self._log(f"Output:\n{clean_output.strip() if clean_output else '(no output)'}")
+
+    def _compact_facts(self) -> None:
+        """Fold the oldest facts into ``state.facts_summary``, leaving room for the next steps.
+
+        Called from the agent loop between steps, never while a command is
+        being recorded, so the summarization call cannot interleave with
+        debugger setup.
+        """
+        facts = self.state.facts
+        excess = len(facts) - _FACTS_LIMIT + _FACTS_COMPACT_BATCH
+        oldest = [facts.popleft() for _ in range(min(max(excess, 0), len(facts)))]
+        if not oldest:
+            return
+        instruction = str(self.prompt_config.get("facts_summary_instruction", ""))
+        prompt = "\n\n".join(
+            part for part in (instruction, self._language_instruction(), "Observations:\n" + "\n".join(oldest)) if part
+        )
+        try:
+            summary = self._call_llm(prompt).strip()
+        except Exception as exc:
+            self._log(f"Fact summarization failed, dropping {len(oldest)} oldest facts: {exc}")
+            return
+        if not summary:
+            return
+        combined = f"{self.state.facts_summary}\n{summary}" if self.state.facts_summary else summary
+        self.state.facts_summary = head_tail_truncate(combined, _FACTS_SUMMARY_MAX)
+
+    def _record_attempt(self, cmd: str, snippet: str) -> None:
+        self._attempts_total += 1
+        self.state.attempts.append(Attempt(cmd=cmd, output_snippet=intern_snippet(snippet)))
+        if self._attempts_fp is not None:
+            self._journal(self._attempts_fp, {"cmd": cmd, "snippet": snippet})
 
     def _fallback_report(self) -> str:
         lines = [
@@ -484,76 +774,62 @@ class DebugAgentRunner:
 
     def _write_report(self, final_report: str) -> None:
         self.request.report_path.parent.mkdir(parents=True, exist_ok=True)
-        content_lines = [
-            f"# dbgagent report — {self.state.session_id}",
-            "",
-            f"Goal: {self.request.goal_type}",
-            f"Goal notes: {self.request.goal_text or '(none)'}",
-            "",
-            "## Final Report",
-            final_report.strip(),
-        ]
         backend_name = getattr(self.backend, "name", None) or self.request.debugger
-        session_section = [
-            "",
-            "## Session Details",
-            f"Debugger backend: {backend_name}",
-            f"LLM provider: {self.request.provider}",
-            f"LLM model: {self.request.model or '(default)'}",
-            f"Language: {self.request.language}",
-            f"Max steps: {self.request.max_steps}",
-        ]
-        if self.request.log_enabled and self.request.log_path:
-            session_section.append(f"Session log: {self.request.log_path}")
-        content_lines += session_section
-        if self.usage_entries:
-            total_prompt = int(self.usage_totals.get("prompt_tokens", 0) or 0)
-            total_completion = int(self.usage_totals.get("completion_tokens", 0) or 0)
-            total_tokens = int(self.usage_totals.get("total_tokens", 0) or 0)
-            total_cost = float(self.usage_totals.get("cost", 0.0) or 0.0)
-            content_lines += [
-                "",
-                "## LLM Usage",
-                f"Total prompt tokens: {total_prompt}",
-                f"Total completion tokens: {total_completion}",
-                f"Total tokens: {total_tokens}",
-            ]
-            if total_cost:
-                content_lines.append(f"Total estimated cost (USD): ${total_cost:.6f}")
-            content_lines.append("")
-            content_lines.append("Per-call usage:")
-            for idx, entry in enumerate(self.usage_entries, start=1):
-                parts = [f"provider={entry['provider']}", f"model={entry['model']}"]
-                for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
-                    if key in entry:
-                        parts.append(f"{key}={entry[key]}")
-                if "cost" in entry:
-                    parts.append(f"cost=${entry['cost']:.6f}")
-                content_lines.append(f"- Call {idx}: " + ", ".join(parts))
-        content_lines += [
-            "",
-            "## Executed Commands",
-        ]
-        if self.state.attempts:
-            for attempt in self.state.attempts:
-                content_lines.append(f"- `{attempt.cmd}`: {attempt.output_snippet}")
-        else:
-            content_lines.append("- (none)")
-        content_lines += [
-            "",
-            "## Notes",
-            "You can edit this report and pass it back to dbgagent with --resume-from to continue the investigation.",
-        ]
-        self.request.report_path.write_text("\n".join(content_lines), encoding="utf-8")
+        totals = self.usage_totals
+        total_prompt = totals["prompt_tokens"]
+        total_completion = totals["completion_tokens"]
+        total_tokens = totals["total_tokens"]
+        total_cached = totals["cached_tokens"]
+        total_cost = totals["cost"]
+        with self.request.report_path.open("w", encoding="utf-8", buffering=65536) as fh:
+            w = fh.write
+            w(f"# dbgagent report — {self.state.session_id}\n\n")
+            w(f"Goal: {self.request.goal_type}\n")
+            w(f"Goal notes: {self.request.goal_text or '(none)'}\n\n")
+            w("## Final Report\n")
+            w(final_report.strip() + "\n")
+            w("\n## Session Details\n")
+            w(f"Debugger backend: {backend_name}\n")
+            w(f"LLM provider: {self.request.provider}\n")
+            w(f"LLM model: {self.request.model or '(default)'}\n")
+            w(f"Language: {self.request.language}\n")
+            w(f"Max steps: {self.request.max_steps}\n")
+            if self.request.log_enabled and self.request.log_path:
+                w(f"Session log: {self.request.log_path}\n")
+            if self.usage_entries:
+                w("\n## LLM Usage\n")
+                w(f"Total prompt tokens: {total_prompt}\n")
+                w(f"Total completion tokens: {total_completion}\n")
+                w(f"Total tokens: {total_tokens}\n")
+                if total_cached:
+                    w(f"Total cached prompt tokens: {total_cached}\n")
+                if total_cost:
+                    w(f"Total estimated cost (USD): ${total_cost:.6f}\n")
+                w("\nPer-call usage:\n")
+                fh.writelines(
+                    f"- Call {idx}: {_format_usage_entry(entry)}\n"
+                    for idx, entry in enumerate(self.usage_entries, start=1)
+                )
+            w("\n## Executed Commands\n")
+            dropped = self._attempts_total - len(self.state.attempts)
+            if dropped > 0:
+                w(
+                    f"- ({dropped} earlier commands not listed; all {self._attempts_total} are in "
+                    f"{self.request.report_path.with_suffix('.attempts.jsonl').name})\n"
+                )
+            if self.state.attempts:
+                fh.writelines(f"- `{attempt.cmd}`: {attempt.output_snippet}\n" for attempt in self.state.attempts)
+            else:
+                w("- (none)\n")
+            w("\n## Notes\n")
+            w("You can edit this report and pass it back to dbgagent with --resume-from to continue the investigation.\n")
         if self.usage_entries:
-            total_prompt = int(self.usage_totals.get("prompt_tokens", 0) or 0)
-            total_completion = int(self.usage_totals.get("completion_tokens", 0) or 0)
-            total_tokens = int(self.usage_totals.get("total_tokens", 0) or 0)
-            total_cost = float(self.usage_totals.get("cost", 0.0) or 0.0)
             summary = (
                 f"LLM totals — prompt_tokens={total_prompt}, completion_tokens={total_completion}, "
                 f"total_tokens={total_tokens}"
             )
+            if total_cached:
+                summary += f", cached_tokens={total_cached}"
             if total_cost:
                 summary += f", cost=${total_cost:.6f}"
             self._log(summary)
@@ -561,7 +837,7 @@ class DebugAgentRunner:
 
     # ------------------------------------------------------------------
     def _log(self, message: str) -> None:
-        if self.request.log_enabled and self._handler is not None:
+        if self._log_on:
             self.logger.info(message)
 
 
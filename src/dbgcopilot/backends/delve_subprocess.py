@@ -16,11 +16,52 @@ except Exception:  # pragma: no cover - import error surfaced at runtime
     pexpect = None  # type: ignore
 
 
+# Prompt matching only rescans this many trailing bytes of the buffer after
+# each read; "(dlv) " is 6 bytes, so large dumps no longer rescan everything.
+_SEARCH_WINDOW = 4096
+
+
+# Line boundaries str.splitlines() honours besides "\n" (after CRLF -> LF).
+_OTHER_LINE_BREAK_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# Command separators accepted in one run_command() call.
+_SPLIT_RE = re.compile(r"[\r\n;]+")
+
+
+def _decode(data: Any) -> str:
+    if not data:
+        return ""
+    if isinstance(data, bytes):
+        return data.decode("utf-8", "replace")
+    return str(data)
+
+
+def _strip_echo(text: str, cmd: str) -> str:
+    """Drop the echoed command line and normalize line breaks to "\n".
+
+    Equivalent to ``"\n".join(lines)`` over ``text.splitlines()`` minus a first
+    line equal to ``cmd``, but for the usual CRLF/LF pty output it avoids
+    building a list with one string per line.
+    """
+    norm = text.replace("\r\n", "\n")
+    if _OTHER_LINE_BREAK_RE.search(norm):
+        lines = text.splitlines()
+        if lines and lines[0].strip() == cmd:
+            lines = lines[1:]
+        return "\n".join(lines)
+    nl = norm.find("\n")
+    first = norm if nl == -1 else norm[:nl]
+    if first.strip() == cmd:
+        norm = "" if nl == -1 else norm[nl + 1 :]
+    if norm.endswith("\n"):
+        norm = norm[:-1]
+    return norm
+
+
 class DelveSubprocessBackend:
     """Minimal Delve CLI wrapper driven through a pexpect session."""
 
     name = "delve"
-    _EXIT_COMMANDS = {"quit", "exit", "q"}
+    _EXIT_COMMANDS = frozenset({"quit", "exit", "q"})
 
     def __init__(
         self,
@@ -38,7 +79,10 @@ class DelveSubprocessBackend:
         self.working_dir = working_dir or os.getcwd()
         self.child: Optional[Any] = None
         self.prompt = "(dlv) "
-        self._prompt_re = re.compile(r"\(dlv\)\s")
+        # The child runs in bytes mode: pexpect matches the fixed prompt with a
+        # plain substring search (expect_exact, no regex) on raw bytes, and only
+        # the captured output of each command is decoded, once.
+        self._prompt_bytes = b"(dlv) "
         self._startup_output: str = ""
 
     @property
@@ -54,9 +98,13 @@ class DelveSubprocessBackend:
             self.delve_path,
             args,
             cwd=self.working_dir,
-            encoding="utf-8",
             timeout=self.timeout,
+            searchwindowsize=_SEARCH_WINDOW,
         )
+        # pexpect sleeps 50 ms before every send by default; the pty buffers input anyway
+        self.child.delaybeforesend = None
+        self.child.delayafterclose = 0
+        self.child.delayafterterminate = 0
         try:
             banner = self._expect_prompt()
         except (pexpect.EOF, pexpect.TIMEOUT) as exc:  # type: ignore[arg-type]
@@ -87,41 +135,30 @@ class DelveSubprocessBackend:
 
     # Internal helpers -------------------------------------------------
     def _split_commands(self, text: str) -> List[str]:
-        pieces: List[str] = []
-        for segment in text.replace("\r", "\n").split("\n"):
-            pieces.extend([p.strip() for p in segment.split(";") if p.strip()])
+        pieces = [piece for piece in map(str.strip, _SPLIT_RE.split(text)) if piece]
         return pieces or [text]
 
     def _expect_prompt(self) -> str:
         if self.child is None:
             raise RuntimeError("Delve subprocess is not running")
-        self.child.expect(self._prompt_re)
-        return self.child.before or ""
+        self.child.expect_exact(self._prompt_bytes)
+        return _decode(self.child.before)
 
     def _send_and_capture(self, cmd: str, timeout: Optional[float] = None) -> str:
         if self.child is None:
             raise RuntimeError("Delve subprocess is not running")
         child: Any = self.child
         child.sendline(cmd)
-        old_timeout = child.timeout
-        if timeout is not None:
-            child.timeout = timeout
-        try:
-            child.expect(self._prompt_re)
-            out = child.before or ""
-        finally:
-            child.timeout = old_timeout
-        cleaned = out.lstrip("\r\n")
-        lines = cleaned.splitlines()
-        if lines and lines[0].strip() == cmd.strip():
-            lines = lines[1:]
-        return "\n".join(lines)
+        # timeout=-1 means "use child.timeout"; no need to swap the attribute.
+        child.expect_exact(self._prompt_bytes, timeout=-1 if timeout is None else timeout)
+        out = _decode(child.before)
+        return _strip_echo(out.lstrip("\r\n"), cmd.strip())
 
     def _format_startup_error(self, exc: Exception) -> str:
         output = ""
         if self.child is not None:
             try:
-                output = (self.child.before or "").strip()
+                output = _decode(self.child.before).strip()
             except Exception:
                 output = ""
             try:
@@ -5,25 +5,98 @@ when the gdb Python module isn't available (e.g., unit tests).
 """
 from __future__ import annotations
 
+import re
+from typing import Iterator
+
+# Resolved once: outside GDB a failed import would otherwise rescan sys.path
+# on every command.
+try:  # pragma: no cover - only available inside gdb
+    import gdb  # type: ignore
+except Exception:  # pragma: no cover
+    gdb = None  # type: ignore
+
+from .query_cache import QueryCache
+
+# Command separators accepted in one run_command() call.
+_SPLIT_RE = re.compile(r"[\r\n;]+")
+
+# First words of commands that resume the inferior; their output gets the stop
+# reason and a short backtrace appended. Matched as whole words so `rbreak`,
+# `call` or `nosharedlibrary` do not trigger the extra queries.
+_STATE_CHANGING = frozenset(
+    {
+        "run", "r", "start",
+        "continue", "c", "cont",
+        "next", "n", "nexti", "ni",
+        "step", "s", "stepi", "si",
+        "finish", "fin",
+        "until", "u",
+    }
+)
+
+_PLACEHOLDER_BT = "#0  0x00000000 in ?? ()\n#1  main () at demo.c:12"
+
+
+def _execute_or_empty(command: str) -> str:
+    try:
+        return gdb.execute(command, to_string=True)
+    except Exception:
+        return ""
+
+
+def _stop_summary() -> list[str]:
+    """Return the non-empty outputs of `info program` and `bt 5`."""
+    try:
+        # One dispatch for both; GDB runs the lines in order.
+        both = gdb.execute("info program\nbt 5", to_string=True)
+        return [both] if both else []
+    except Exception:
+        # Older GDB rejects multi-line input, and a failing `bt` (no stack)
+        # discards the captured `info program` text; ask separately.
+        return [o for o in (_execute_or_empty("info program"), _execute_or_empty("bt 5")) if o]
+
+
 class GdbInProcessBackend:
     name = "gdb"
 
+    def __init__(self) -> None:
+        # Read-only query results, valid until the next state-changing command
+        self._cache = QueryCache()
+        self._prompt_hooked = False
+
     def initialize_session(self) -> None:
         # Configure GDB output to be script-friendly
-        try:  # Import only works inside GDB
-            import gdb  # type: ignore
-
-            gdb.execute("set pagination off", to_string=True)
-            gdb.execute("set height 0", to_string=True)
-            gdb.execute("set width 0", to_string=True)
+        if gdb is None:
+            return
+        self._cache.invalidate()
+        if not self._prompt_hooked:
+            try:
+                # Commands typed at gdb's own prompt bypass run_command; drop the
+                # cache whenever gdb gets its prompt back.
+                gdb.events.before_prompt.connect(self._on_before_prompt)
+                self._prompt_hooked = True
+            except Exception:
+                pass
+        init_cmds = [
+            "set pagination off",
+            "set height 0",
+            "set width 0",
+            # Plain, compact output: no ANSI styling, one-line structs, no thread chatter
+            "set style enabled off",
+            "set print pretty off",
+            "set print thread-events off",
+            "set verbose off",
+            # Read symbols on all cores (GDB 11+)
+            "maint set worker-threads unlimited",
             # Avoid interactive debuginfod prompt loops in non-interactive REPL usage
+            "set debuginfod enabled off",
+        ]
+        for c in init_cmds:
             try:
-                gdb.execute("set debuginfod enabled off", to_string=True)
+                gdb.execute(c, to_string=True)
             except Exception:
+                # Setting unknown to this GDB version; ignore
                 pass
-        except Exception:
-            # Not running inside GDB or settings failed; ignore
-            pass
 
     def run_command(self, cmd: str, timeout: float | None = None) -> str:
         """Execute one or more GDB commands and return concatenated output.
@@ -33,49 +106,54 @@ class GdbInProcessBackend:
         - Enhances output for state-changing commands by appending stop reason and a short bt.
         - Falls back to placeholder only when not inside GDB (no gdb module).
         """
-        # Detect if we're inside GDB
-        try:
-            import gdb  # type: ignore
-        except Exception:
+        return "".join(self.run_command_iter(cmd, timeout=timeout))
+
+    def run_command_iter(self, cmd: str, timeout: float | None = None) -> Iterator[str]:
+        """Yield run_command()'s output one command at a time.
+
+        gdb.execute hands back each command's output whole, so pieces are per
+        command; ``"".join()`` of them is exactly run_command(cmd).
+        """
+        if gdb is None:
             if cmd.strip() == "bt":
-                return "#0  0x00000000 in ?? ()\n#1  main () at demo.c:12"
-            return f"(placeholder output) ran: {cmd}"
+                yield _PLACEHOLDER_BT
+            else:
+                yield f"(placeholder output) ran: {cmd}"
+            return
 
-        outputs: list[str] = []
+        # Separates the output of consecutive commands once something was written
+        sep = ""
         # Split on ';' and newlines for simple multi-command sequences
-        parts = []
-        for chunk in cmd.replace("\r", "\n").split("\n"):
-            parts.extend([p.strip() for p in chunk.split(";") if p.strip()])
+        parts = [p for p in map(str.strip, _SPLIT_RE.split(cmd)) if p]
 
+        cache = self._cache
         for part in parts or [cmd.strip()]:
+            hit = cache.lookup(part)
+            if hit is not None:
+                if hit:
+                    yield sep + hit
+                    sep = "\n"
+                continue
             try:
                 # Run as-if typed by a human (from_tty=True) but capture output (to_string=True)
                 out = gdb.execute(part, from_tty=True, to_string=True)
                 text = out if isinstance(out, str) else str(out)
+                cache.store(part, text)
             except Exception as e:  # gdb.error or others
                 text = f"[gdb error] {e}"
 
-            lower = part.lower()
-            if lower.startswith(("run", "r", "continue", "c", "next", "n", "step", "s", "finish", "start")):
+            verb = part.split(None, 1)[0].lower() if part else ""
+            if verb in _STATE_CHANGING:
                 # Append stop reason and short backtrace
-                try:
-                    stop = gdb.execute("info program", to_string=True)
-                except Exception:
-                    stop = ""
-                try:
-                    bt = gdb.execute("bt 5", to_string=True)
-                except Exception:
-                    bt = ""
-                if stop:
-                    if text and not text.endswith("\n"):
-                        text += "\n"
-                    text += stop
-                if bt:
+                for extra in _stop_summary():
                     if text and not text.endswith("\n"):
                         text += "\n"
-                    text += bt
+                    text += extra
             # For 'file' and similar loader commands, GDB usually prints 'Reading symbols...' when from_tty
             # We've already run with from_tty=True above so such messages should be included in 'text'.
-            outputs.append(text)
+            if text:
+                yield sep + text
+                sep = "\n"
 
-        return "\n".join(o for o in outputs if o)
+    def _on_before_prompt(self) -> None:  # pragma: no cover - gdb environment
+        self._cache.invalidate()
@@ -1,39 +1,125 @@
-"""GDB subprocess backend using pexpect.
+"""GDB subprocess backend speaking GDB/MI over pipes.
 
-Spawns an interactive `gdb -q` process and drives it via a pseudo-tty.
+Spawns `gdb --interpreter=mi2 -q` with plain pipes and runs each user command
+through `-interpreter-exec console`, so output is framed by MI records and the
+`(gdb)` terminator instead of a pseudo-tty prompt match. The debuggee gets its
+own pty (`set inferior-tty`), which keeps its output line-buffered and stops it
+from reading our MI commands off gdb's stdin.
 Suitable for the standalone copilot> REPL where we're outside of GDB.
 """
 from __future__ import annotations
 
-from typing import Optional, List, Any
+from typing import Optional, Iterator, List, Any
+import codecs
+import os
 import re
+import select
+import subprocess
+import time
 
-try:
-    import pexpect
-except Exception as _e:  # pragma: no cover - import error surfaced at runtime
-    pexpect = None  # type: ignore
+from .query_cache import QueryCache, is_query
+
+# MI c-string escapes; octal escapes carry raw (usually UTF-8) bytes.
+_MI_ESCAPE_RE = re.compile(rb'\\([0-7]{1,3}|.)')
+_MI_ERROR_MSG_RE = re.compile(rb'msg=("(?:[^"\\]|\\.)*")')
+_MI_ESCAPES = {
+    b"n": b"\n",
+    b"t": b"\t",
+    b"r": b"\r",
+    b"e": b"\x1b",
+    b"a": b"\a",
+    b"b": b"\b",
+    b"f": b"\f",
+    b"v": b"\v",
+}
+
+
+def _mi_unescape_byte(m: "re.Match[bytes]") -> bytes:
+    esc = m.group(1)
+    if esc[:1].isdigit():
+        return bytes((int(esc, 8) & 0xFF,))
+    return _MI_ESCAPES.get(esc, esc)
+
+
+def _mi_cstring(raw: bytes) -> bytes:
+    """Decode the body of an MI stream record (``"..."`` including quotes)."""
+    if raw[:1] == b'"' and raw[-1:] == b'"':
+        raw = raw[1:-1]
+    if b"\\" not in raw:
+        return raw
+    return _MI_ESCAPE_RE.sub(_mi_unescape_byte, raw)
+
+
+# Command separators accepted in one run_command() call.
+_SPLIT_RE = re.compile(r"[\r\n;]+")
+# Line boundaries str.splitlines() honours; CRLF counts as one.
+_LINE_BREAK_RE = re.compile("\r\n|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+_NEEDS_LINE_BREAK_SUB_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class _OutputNormalizer:
+    """Trim leading newlines, map line breaks to LF and drop one trailing newline.
+
+    Feeding a command's output in any number of pieces and then calling
+    ``finish()`` yields, concatenated, ``"\n".join(text.lstrip("\r\n").splitlines())``
+    for the whole text. A trailing CR or LF is held back until the next piece
+    shows whether it ends the output.
+    """
+
+    __slots__ = ("_started", "_pending")
+
+    def __init__(self) -> None:
+        self._started = False
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        if self._pending:
+            text = self._pending + text
+            self._pending = ""
+        if not self._started:
+            text = text.lstrip("\r\n")
+            if not text:
+                return ""
+            self._started = True
+        hold = ""
+        if text.endswith("\r"):
+            text, hold = text[:-1], "\r"
+        if _NEEDS_LINE_BREAK_SUB_RE.search(text):
+            text = _LINE_BREAK_RE.sub("\n", text)
+        if text.endswith("\n"):
+            text, hold = text[:-1], "\n" + hold
+        self._pending = hold
+        return text
+
+    def finish(self) -> str:
+        tail = _LINE_BREAK_RE.sub("\n", self._pending)
+        self._pending = ""
+        return tail[:-1] if tail.endswith("\n") else tail
+
+
+def _mi_quote(cmd: str) -> str:
+    return '"' + cmd.replace("\\", "\\\\").replace('"', '\\"') + '"'
 
 
 class GdbSubprocessBackend:
     name = "gdb"
 
-    _EXIT_COMMANDS = {"quit", "exit", "q"}
+    _EXIT_COMMANDS = frozenset({"quit", "exit", "q"})
 
     def __init__(self, gdb_path: str = "gdb", timeout: float = 10.0) -> None:
         self.gdb_path = gdb_path
         self.timeout = timeout
-        self.child: Optional[Any] = None
-        # Default GDB prompt ends with "(gdb) "; match leniently with optional spaces
-        self._prompt_re = re.compile(r"\(gdb\)\s", re.MULTILINE)
+        self.child: Optional[subprocess.Popen] = None
         self.prompt = "(gdb) "
+        self._token = 0
+        self._buf = bytearray()
+        # Read-only query results, valid until the next state-changing command
+        self._cache = QueryCache()
+        # Inferior terminal; the slave stays open so reads on the master never hit EIO.
+        self._tty_master: Optional[int] = None
+        self._tty_slave: Optional[int] = None
 
     def initialize_session(self) -> None:
-        if pexpect is None:
-            raise RuntimeError("pexpect is not available; cannot start subprocess backend")
-        # Spawn gdb quietly; use encoding for str I/O
-        self.child = pexpect.spawn(self.gdb_path, ["-q"], encoding="utf-8", timeout=self.timeout)
-        # Consume banner until prompt
-        self._expect_prompt()
         # Configure GDB for non-interactive usage
         init_cmds = [
             "set pagination off",
@@ -41,96 +127,307 @@ class GdbSubprocessBackend:
             "set width 0",
             # Avoid blocking confirmations in non-interactive sessions
             "set confirm off",
+            # Plain, compact output: no ANSI styling, one-line structs, no thread chatter
+            "set style enabled off",
+            "set print pretty off",
+            "set print thread-events off",
+            "set verbose off",
+            # Read symbols on all cores (GDB 11+)
+            "maint set worker-threads unlimited",
+            # Debuginfod can prompt; unknown on older GDB, which just reports an error
+            "set debuginfod enabled off",
         ]
-        # Debuginfod can prompt; try to disable if supported
-        for c in init_cmds + ["set debuginfod enabled off"]:
-            try:
-                self._send_and_capture(c)
-            except Exception:
-                # Ignore failures (older GDB may not support debuginfod setting)
-                pass
+        tty = self._open_inferior_tty()
+        if tty:
+            init_cmds.append(f"set inferior-tty {tty}")
+        # -ex runs after the user's gdbinit files (same precedence as sending
+        # the settings afterwards) and costs no round trip per setting; a
+        # failing command does not stop the ones after it.
+        argv = [self.gdb_path, "--interpreter=mi2", "-q"]
+        for c in init_cmds:
+            argv += ["-ex", c]
+        self.child = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        )
+        self._buf.clear()
+        self._cache.invalidate()
+        # Consume the startup records up to the first terminator
+        for _ in self._iter_response(None, time.monotonic() + self.timeout):
+            pass
 
     # Internal helpers
-    def _expect_prompt(self) -> str:
-        if self.child is None:
-            raise RuntimeError("GDB subprocess is not running")
+    def _open_inferior_tty(self) -> Optional[str]:
+        self._close_inferior_tty()
+        try:
+            master, slave = os.openpty()
+        except (AttributeError, OSError):
+            return None
+        self._tty_master, self._tty_slave = master, slave
+        os.set_blocking(master, False)
+        return os.ttyname(slave)
+
+    def _close_inferior_tty(self) -> None:
+        for fd in (self._tty_master, self._tty_slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._tty_master = self._tty_slave = None
+
+    def _fill(self, deadline: float, sink: List[bytes]) -> None:
+        """Wait for more gdb output; inferior output goes straight to ``sink``."""
         child: Any = self.child
-        # Expect either the prompt or EOF/timeout; let exceptions surface for caller
-        child.expect(self._prompt_re)
-        return child.before or ""
+        out_fd = child.stdout.fileno()
+        fds = [out_fd] if self._tty_master is None else [out_fd, self._tty_master]
+        ready, _, _ = select.select(fds, [], [], max(0.0, deadline - time.monotonic()))
+        if not ready:
+            raise TimeoutError("no response from gdb before the timeout")
+        if self._tty_master in ready:
+            try:
+                sink.append(os.read(self._tty_master, 65536))
+            except (BlockingIOError, OSError):
+                pass
+        if out_fd in ready:
+            data = os.read(out_fd, 65536)
+            if not data:
+                raise EOFError("gdb exited")
+            self._buf += data
+
+    def _drain_inferior(self, sink: List[bytes]) -> None:
+        # Pick up debuggee output already queued on its pty without waiting
+        master = self._tty_master
+        if master is None:
+            return
+        while True:
+            try:
+                data = os.read(master, 65536)
+            except (BlockingIOError, OSError):
+                return
+            if not data:
+                return
+            sink.append(data)
+
+    def _iter_response(self, token: Optional[bytes], deadline: float) -> Iterator[bytes]:
+        """Yield console text for one command until its result and `(gdb)` terminator.
+
+        Text is yielded whenever the records read so far are used up and we
+        would block for more, so long outputs arrive in pieces. With ``token``
+        None this just reads to the next terminator (startup). Execution
+        commands answer ``^running`` first; for those we keep reading until the
+        ``*stopped`` record, matching the blocking CLI behaviour.
+        """
+        buf = self._buf
+        chunks: List[bytes] = []
+        logged: List[bytes] = []
+        done = token is None
+        running = stopped = False
+        error: Optional[bytes] = None
+        while True:
+            nl = buf.find(b"\n")
+            if nl < 0:
+                if chunks:
+                    yield b"".join(chunks)
+                    chunks.clear()
+                self._fill(deadline, chunks)
+                continue
+            line = bytes(buf[:nl])
+            del buf[: nl + 1]
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            kind = line[:1]
+            if kind in (b"~", b"@", b"&"):
+                text = _mi_cstring(line[1:])
+                chunks.append(text)
+                if kind == b"&":
+                    logged.append(text)
+            elif line.rstrip() == b"(gdb)":
+                if done or (running and stopped):
+                    break
+            elif token is not None and line.startswith(token) and line[len(token) : len(token) + 1] == b"^":
+                cls, _, rest = line[len(token) + 1 :].partition(b",")
+                if cls == b"running":
+                    running = True
+                else:
+                    done = True
+                    m = _MI_ERROR_MSG_RE.match(rest) if cls == b"error" else None
+                    if m:
+                        error = _mi_cstring(m.group(1))
+            elif running and line.startswith(b"*stopped"):
+                # Only a stop after our own ^running counts; an earlier command
+                # that timed out can leave its *stopped record in the buffer.
+                stopped = True
+            elif kind in (b"*", b"=", b"^") or (kind.isdigit() and b"^" in line):
+                # Async/notify records and stale results carry nothing for the user
+                continue
+            elif line:
+                chunks.append(line + b"\n")
+        self._drain_inferior(chunks)
+        # gdb usually logs the error text itself (& record) before ^error
+        if error and error not in b"".join(logged):
+            chunks.append(error)
+        if chunks:
+            yield b"".join(chunks)
 
-    def _send_and_capture(self, cmd: str, timeout: Optional[float] = None) -> str:
+    def _send(self, cmds: List[str]) -> List[bytes]:
+        """Write tokenized MI requests for ``cmds`` in one go and return their tokens."""
         if self.child is None:
             raise RuntimeError("GDB subprocess is not running")
         child: Any = self.child
-        # Send command and wait for next prompt; capture output in-between
-        child.sendline(cmd)
-        # Use per-call timeout if provided
-        old_timeout = child.timeout
-        if timeout is not None:
-            child.timeout = timeout
-        try:
-            child.expect(self._prompt_re)
-            out = child.before or ""
-        finally:
-            child.timeout = old_timeout
-        # Strip a single trailing newline that typically precedes the prompt
-        # Also remove echoed command if present as the first line
-        text = out.lstrip("\r\n")
-        lines = text.splitlines()
-        if lines and lines[0].strip() == cmd.strip():
-            lines = lines[1:]
-        return "\n".join(lines)
+        tokens: List[bytes] = []
+        lines: List[str] = []
+        for cmd in cmds:
+            self._token += 1
+            token = str(self._token)
+            tokens.append(token.encode())
+            lines.append(f"{token}-interpreter-exec console {_mi_quote(cmd)}\n")
+        child.stdin.write("".join(lines).encode("utf-8"))
+        return tokens
 
-    def run_command(self, cmd: str, timeout: float | None = None) -> str:
+    def _iter_capture(self, token: bytes, timeout: Optional[float] = None) -> Iterator[str]:
+        """Decoded, normalized output pieces for one command."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        norm = _OutputNormalizer()
+        for data in self._iter_response(token, deadline):
+            text = norm.feed(decoder.decode(data))
+            if text:
+                yield text
+        text = norm.feed(decoder.decode(b"", final=True)) + norm.finish()
+        if text:
+            yield text
+
+    def run_command_iter(self, cmd: str, timeout: float | None = None) -> Iterator[str]:
+        """Yield the output of ``cmd`` piece by piece as gdb produces it.
+
+        ``"".join(run_command_iter(cmd))`` is exactly ``run_command(cmd)``.
+        Abandoning the iterator early still reads the remaining responses off
+        the pipe, so the next command does not see them.
+        """
         if self.child is None:
             raise RuntimeError("GDB subprocess is not initialized; call initialize_session()")
         # Split multiple commands on newlines and ';'
-        parts: List[str] = []
-        for chunk in (cmd or "").replace("\r", "\n").split("\n"):
-            parts.extend([p.strip() for p in chunk.split(";") if p.strip()])
-        if not parts:
-            parts = [cmd.strip()]
+        parts = [p for p in map(str.strip, _SPLIT_RE.split(cmd or "")) if p] or [cmd.strip()]
 
-        outputs: List[str] = []
+        batch: List[str] = []
+        exit_part: Optional[str] = None
         for part in parts:
-            lower = part.lower()
-            if lower in self._EXIT_COMMANDS:
-                msg = self._handle_exit_command(part)
-                if msg:
-                    outputs.append(msg)
-                break
-            try:
-                out = self._send_and_capture(part, timeout=timeout)
-            except pexpect.TIMEOUT as e:  # type: ignore[attr-defined]
-                outputs.append(f"[gdb timeout] {part}: {e}")
-                continue
-            except pexpect.EOF as e:  # type: ignore[attr-defined]
-                outputs.append(f"[gdb eof] {part}: {e}")
+            if part.lower() in self._EXIT_COMMANDS:
+                exit_part = part
                 break
-            except Exception as e:
-                outputs.append(f"[gdb error] {part}: {e}")
-                continue
-            # Normalize Windows-style newlines just in case
-            outputs.append(out.replace("\r\n", "\n"))
-        return "\n".join(o for o in outputs if o)
+            batch.append(part)
 
-    def _handle_exit_command(self, cmd: str) -> str:
-        if self.child is None:
-            return "[gdb closed] session already terminated"
-        child: Any = self.child
+        # Repeated queries since the last state change are answered locally;
+        # the generation seen here guards results that arrive after a later part
+        # in this batch has invalidated the cache.
+        cache = self._cache
+        cached: List[Optional[str]] = []
+        generations: List[int] = []
+        for part in batch:
+            cached.append(cache.lookup(part))
+            generations.append(cache.generation)
+        to_send = [part for part, hit in zip(batch, cached) if hit is None]
+
+        # Pipeline the whole batch in one write: gdb still executes (and fails)
+        # each command on its own, but we pay one wake-up instead of one per part.
+        # Execution commands hold later requests until the inferior stops.
         try:
-            child.sendline(cmd)
-            try:
-                child.expect(pexpect.EOF, timeout=self.timeout)  # type: ignore[arg-type]
-            except Exception:
-                # Swallow EOF/timeout errors; we'll reset below regardless
-                pass
+            tokens = iter(self._send(to_send) if to_send else [])
+        except OSError as e:
+            yield f"[gdb eof] {to_send[0]}: {e}"
+            return
+        current: Optional[Iterator[str]] = None
+        # Separates the output of consecutive commands once something was written
+        sep = ""
+        try:
+            for part, hit, generation in zip(batch, cached, generations):
+                if hit is not None:
+                    if hit:
+                        yield sep + hit
+                        sep = "\n"
+                    continue
+                kept: Optional[List[str]] = [] if is_query(part) else None
+                current = self._iter_capture(next(tokens), timeout=timeout)
+                wrote = False
+                try:
+                    for piece in current:
+                        if wrote:
+                            yield piece
+                        else:
+                            yield sep + piece
+                            wrote, sep = True, "\n"
+                        if kept is not None:
+                            kept.append(piece)
+                except TimeoutError as e:
+                    # The inferior may still be running; nothing cached stays valid
+                    cache.invalidate()
+                    yield f"{sep}[gdb timeout] {part}: {e}"
+                    sep = "\n"
+                    continue
+                except EOFError as e:
+                    yield f"{sep}[gdb eof] {part}: {e}"
+                    break
+                except Exception as e:
+                    yield f"{sep}[gdb error] {part}: {e}"
+                    sep = "\n"
+                    continue
+                if kept is not None:
+                    cache.store(part, "".join(kept), generation)
+            else:
+                if exit_part is not None:
+                    msg = self._handle_exit_command(exit_part)
+                    if msg:
+                        yield sep + msg
         finally:
+            # A consumer that stopped early must not leave responses in the pipe
             try:
-                child.close(force=True)
+                if current is not None:
+                    for _ in current:
+                        pass
+                for token in tokens:
+                    for _ in self._iter_response(token, time.monotonic() + self.timeout):
+                        pass
             except Exception:
                 pass
+
+    def run_command(self, cmd: str, timeout: float | None = None) -> str:
+        return "".join(self.run_command_iter(cmd, timeout=timeout))
+
+    def _stop_child(self, grace: float) -> None:
+        child: Any = self.child
+        self.child = None
+        if child is None:
+            return
+        try:
+            if child.poll() is None:
+                try:
+                    child.stdin.write(b"-gdb-exit\n")
+                except OSError:
+                    pass
+                try:
+                    child.wait(timeout=grace)
+                except subprocess.TimeoutExpired:
+                    child.kill()
+                    child.wait()
+        finally:
+            for stream in (child.stdin, child.stdout):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+            self._close_inferior_tty()
+
+    def _handle_exit_command(self, cmd: str) -> str:
+        if self.child is None:
+            return "[gdb closed] session already terminated"
+        try:
+            self._stop_child(self.timeout)
+        except Exception:
+            # Swallow exit errors; we restart below regardless
             self.child = None
 
         try:
@@ -143,14 +440,6 @@ class GdbSubprocessBackend:
     def __del__(self):  # pragma: no cover - best-effort cleanup
         try:
             if self.child:
-                child: Any = self.child
-                if child.isalive():
-                    # Try a graceful quit without confirmation
-                    try:
-                        child.sendline("quit")
-                        child.expect(pexpect.EOF, timeout=1)  # type: ignore[arg-type]
-                    except Exception:
-                        child.close(force=True)
+                self._stop_child(1)
         except Exception:
             pass
-
@@ -6,9 +6,12 @@ pattern used by other debugger backends.
 """
 from __future__ import annotations
 
+import hashlib
+import os
 import re
 import shutil
 import subprocess
+import tempfile
 import time
 from pathlib import Path
 from typing import Any, Optional, Tuple
@@ -19,6 +22,75 @@ except Exception:  # pragma: no cover - runtime dependency check
     pexpect = None  # type: ignore
 
 
+def _compile_cache_root() -> Path:
+    """Where compiled single-file programs are kept across sessions."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "dbgcopilot" / "jdb"
+
+
+# Compiled entries kept in the cache; older or unused ones are pruned after a compile.
+_COMPILE_CACHE_MAX_ENTRIES = 64
+_COMPILE_CACHE_MAX_AGE = 30 * 24 * 3600.0
+
+
+def _prune_compile_cache(root: Path, keep: Path) -> None:
+    """Drop entries not used within the age limit, then the least recently used beyond the count limit.
+
+    Entry age is the ``main-class`` marker's mtime, which cache hits refresh.
+    Leftover temp dirs from crashed compiles are removed after a day.
+    """
+    now = time.time()
+    entries: list[Tuple[float, Path]] = []
+    try:
+        children = list(root.iterdir())
+    except OSError:
+        return
+    for child in children:
+        if child == keep:
+            continue
+        if ".tmp-" in child.name:
+            try:
+                if now - child.stat().st_mtime > 24 * 3600:
+                    shutil.rmtree(child, ignore_errors=True)
+            except OSError:
+                pass
+            continue
+        try:
+            used = (child / "main-class").stat().st_mtime
+        except OSError:
+            used = 0.0
+        entries.append((used, child))
+    entries.sort(reverse=True)
+    for idx, (used, child) in enumerate(entries):
+        if idx >= _COMPILE_CACHE_MAX_ENTRIES - 1 or now - used > _COMPILE_CACHE_MAX_AGE:
+            shutil.rmtree(child, ignore_errors=True)
+
+
+def _compile_key(src_path: Path, src_bytes: bytes) -> str:
+    """Hash everything a single-file ``javac -g`` result depends on.
+
+    That is the source itself, the sibling ``.java`` files javac may pull in
+    from the working directory (by name/size/mtime), and the javac binary.
+    """
+    h = hashlib.blake2b(src_bytes, digest_size=16)
+    for sibling in sorted(src_path.parent.glob("*.java")):
+        if sibling.name == src_path.name:
+            continue
+        try:
+            st = sibling.stat()
+        except OSError:
+            continue
+        h.update(f"\0{sibling.name}:{st.st_size}:{st.st_mtime_ns}".encode())
+    javac = shutil.which("javac")
+    if javac:
+        real = os.path.realpath(javac)
+        try:
+            h.update(f"\0{real}:{os.stat(real).st_mtime_ns}".encode())
+        except OSError:
+            h.update(real.encode())
+    return h.hexdigest()
+
+
 class JavaJdbBackend:
     name = "jdb"
     prompt = "> "
@@ -204,25 +276,75 @@ class JavaJdbBackend:
         src_path = source.resolve()
         if not src_path.exists():
             raise FileNotFoundError(src_path)
+        src_dir = src_path.parent
+        class_dir, main_class = self._compile_cached(src_path)
+        # The compiled classes only exist in the cache dir, so it always leads the classpath
+        cp = class_dir.as_posix()
+        if self.classpath:
+            cp = cp + os.pathsep + self.classpath
+        # Classes live in the cache, so point jdb at the sources for `list`:
+        # the directory above the package path (a/b/Main.java for a.b.Main).
+        sourcepath = self.sourcepath
+        if not sourcepath:
+            pkg_parts = main_class.split(".")[:-1]
+            root = src_dir
+            if pkg_parts and src_dir.parts[-len(pkg_parts) :] == tuple(pkg_parts):
+                root = src_dir.parents[len(pkg_parts) - 1]
+            sourcepath = root.as_posix()
+        # Options must precede the class name; anything after it goes to main()
+        cmd = ["jdb", "-classpath", cp, "-sourcepath", sourcepath, main_class]
+        return cmd, src_dir.as_posix()
+
+    def _compile_cached(self, src_path: Path) -> Tuple[Path, str]:
+        """Return (class dir, main class) for ``src_path``, running javac only on a cache miss.
+
+        Output goes to ``<cache>/<key>/`` via ``javac -d``; the ``main-class``
+        marker is written last, so its presence means a complete compile.
+        """
+        src_bytes = src_path.read_bytes()
+        cache_dir = _compile_cache_root() / _compile_key(src_path, src_bytes)
+        marker = cache_dir / "main-class"
+        try:
+            main_class = marker.read_text(encoding="utf-8").strip()
+        except OSError:
+            pass
+        else:
+            try:
+                # Mark the entry as recently used for pruning
+                os.utime(marker)
+            except OSError:
+                pass
+            return cache_dir, main_class
+
         package = self._detect_package(src_path)
-        compile_dir = src_path.parent
-        result = subprocess.run(
-            ["javac", "-g", str(src_path)],
-            cwd=compile_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if result.returncode != 0:
-            raise RuntimeError(result.stderr.strip() or result.stdout.strip())
         main_class = src_path.stem
         if package:
             main_class = f"{package}.{main_class}"
-        cp = self.classpath or compile_dir.as_posix()
-        cmd = ["jdb", "-classpath", cp, main_class]
-        if self.sourcepath:
-            cmd.extend(["-sourcepath", self.sourcepath])
-        return cmd, compile_dir.as_posix()
+        # Compile into a private dir and rename, so concurrent sessions never
+        # see a half-written entry.
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f"{cache_dir.name}.tmp-", dir=cache_dir.parent))
+        try:
+            result = subprocess.run(
+                ["javac", "-g", "-d", str(tmp_dir), str(src_path)],
+                cwd=src_path.parent,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+            (tmp_dir / "main-class").write_text(main_class + "\n", encoding="utf-8")
+            try:
+                os.replace(tmp_dir, cache_dir)
+            except OSError:
+                # Another session finished the same entry first; use theirs
+                if not marker.exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        _prune_compile_cache(cache_dir.parent, cache_dir)
+        return cache_dir, main_class
 
     def _prepare_from_class(self, compiled: Path) -> Tuple[list[str], Optional[str]]:
         class_file = compiled.resolve()
@@ -289,7 +411,7 @@ class JavaJdbBackend:
         try:
             child.expect(self._prompt_re, timeout=timeout_value)
             out = child.before or ""
-            result = self._normalize_output(command, out)
+            result = self._normalize_output(out)
             if post_drain:
                 drained = self._drain_additional_output(timeout_value)
                 if drained:
@@ -300,13 +422,13 @@ class JavaJdbBackend:
             match = self._prompt_re.search(buffer)
             if match:
                 captured = buffer[: match.start()]
-                result = self._normalize_output(command, captured)
+                result = self._normalize_output(captured)
                 if post_drain:
                     drained = self._drain_additional_output(timeout_value)
                     if drained:
                         result = self._combine_startup(result, drained)
                 return self._combine_startup(startup, result)
-            partial = self._normalize_output(command, buffer)
+            partial = self._normalize_output(buffer)
             if partial:
                 partial = f"{partial}\n{self._prefix()} timeout waiting for prompt after '{command}'"
                 return self._combine_startup(startup, partial)
@@ -314,18 +436,17 @@ class JavaJdbBackend:
         except pexpect.EOF:
             out = child.before or ""
             self.child = None
-            normalized = self._normalize_output(command, out)
+            normalized = self._normalize_output(out)
             drained = ""
             if post_drain:
                 drained = self._drain_additional_output(timeout_value)
             merged = self._combine_startup(startup, normalized, drained)
             return merged or f"{self._prefix()} process exited"
 
-    def _normalize_output(self, command: str, captured: str) -> str:
-        text = (captured or "").replace("\r\n", "\n").lstrip("\r\n")
-        if text.startswith(command):
-            text = text[len(command) :].lstrip()
-        return text.strip()
+    def _normalize_output(self, captured: str) -> str:
+        # The pty runs without echo (see _ensure_session_started), so there is
+        # no echoed command to scrub.
+        return (captured or "").replace("\r\n", "\n").strip()
 
     def _ensure_session_started(self, timeout: float | None = None) -> str:
         if self.child and self.child.isalive():
@@ -343,6 +464,9 @@ class JavaJdbBackend:
                 encoding="utf-8",
                 timeout=timeout or self.timeout,
                 cwd=workdir or self.cwd,
+                # jdb has no line editor of its own, so with tty echo off the
+                # pty never reflects our commands back into the output
+                echo=False,
             )
         except FileNotFoundError as exc:
             self.child = None
@@ -350,6 +474,10 @@ class JavaJdbBackend:
         except Exception as exc:
             self.child = None
             return f"{self._prefix()} failed to launch jdb: {exc}"
+        # No 50 ms pause before each send (pexpect default); jdb reads from a buffered pty
+        self.child.delaybeforesend = None
+        self.child.delayafterclose = 0
+        self.child.delayafterterminate = 0
 
         startup = self._expect_prompt()
         if not self.child or not self.child.isalive():
@@ -378,7 +506,7 @@ class JavaJdbBackend:
             except pexpect.EOF:
                 extra = child.before or ""
                 self.child = None
-                normalized = self._normalize_output("", extra)
+                normalized = self._normalize_output(extra)
                 if normalized:
                     pieces.append(normalized)
                 break
@@ -386,7 +514,7 @@ class JavaJdbBackend:
                 break
             else:
                 extra = child.before or ""
-                normalized = self._normalize_output("", extra)
+                normalized = self._normalize_output(extra)
                 if normalized:
                     pieces.append(normalized)
                     deadline = max(deadline, time.monotonic() + 0.2)
@@ -39,6 +39,10 @@ class LldbSubprocessBackend:
             raise RuntimeError("pexpect is not available; cannot start subprocess backend")
         # Launch LLDB. Use encoding for string I/O.
         self.child = pexpect.spawn(self.lldb_path, [], encoding="utf-8", timeout=self.timeout)
+        # Drop pexpect's per-send 50 ms sleep and the close/terminate grace delays
+        self.child.delaybeforesend = None
+        self.child.delayafterclose = 0
+        self.child.delayafterterminate = 0
         # Immediately set a simple prompt we can match reliably, then expect it
         ansi = r"(?:\x1b\[[0-9;]*m)*"
         try:
@@ -143,6 +143,10 @@ class PythonPdbBackend:
         except Exception as exc:
             self.child = None
             return f"{self._prefix()} failed to launch script: {exc}"
+        # Send without pexpect's default 50 ms delay; pdb's pty queues the input
+        self.child.delaybeforesend = None
+        self.child.delayafterclose = 0
+        self.child.delayafterterminate = 0
 
         startup = self._expect_initial_prompt()
         if not self.child or not self.child.isalive():
@@ -0,0 +1,94 @@
+"""LRU memo for read-only GDB queries.
+
+Agents and users re-ask `bt`, `info registers`, `info breakpoints` and the like
+many times while the program sits at one stop. Those answers only change when a
+command changes debugger state, so the GDB backends serve repeats from here.
+Every command that is not a recognised query counts as a state change (not just
+run/step: `frame`, `up`, `set var`, `break` all change what a query returns).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+# First words of commands whose output depends only on debugger state.
+_QUERY_COMMANDS = frozenset(
+    {
+        "info",
+        "i",
+        "show",
+        "backtrace",
+        "bt",
+        "where",
+        "disassemble",
+        "disas",
+        "whatis",
+        "ptype",
+        "x",
+        "output",
+    }
+)
+# `print` is left out on purpose: each call adds a `$N` value-history entry, so a
+# replayed answer would show a stale `$N`. `output` prints the same value without one.
+# Expression commands may call into the inferior or assign; only plain reads are cached.
+_EXPRESSION_COMMANDS = frozenset({"output"})
+_EXPRESSION_SIDE_EFFECTS = ("(", "=", "++", "--")
+
+
+def is_query(cmd: str) -> bool:
+    """Return True when ``cmd`` only reads debugger state."""
+    verb, _, rest = cmd.strip().partition(" ")
+    # `x/4gx $sp`, `output/x var`: the format suffix does not change the verb
+    verb = verb.split("/", 1)[0].lower()
+    if verb not in _QUERY_COMMANDS:
+        return False
+    if verb in _EXPRESSION_COMMANDS:
+        return not any(tok in rest for tok in _EXPRESSION_SIDE_EFFECTS)
+    if verb == "x":
+        # Bare `x` continues from the last examined address
+        return bool(rest.strip())
+    return True
+
+
+class QueryCache:
+    """Bounded command -> output map, emptied on every state change.
+
+    ``generation`` ticks on each invalidation; callers that look up several
+    commands before their outputs arrive pass the generation seen at lookup to
+    ``store`` so a result from before a state change is never kept.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.generation = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def lookup(self, cmd: str) -> Optional[str]:
+        """Return the cached output for a query; any other command invalidates."""
+        if not is_query(cmd):
+            self.invalidate()
+            return None
+        key = cmd.strip()
+        out = self._entries.get(key)
+        if out is not None:
+            self._entries.move_to_end(key)
+        return out
+
+    def store(self, cmd: str, output: str, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        if not is_query(cmd):
+            return
+        key = cmd.strip()
+        entries = self._entries
+        entries[key] = output
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+__all__ = ["QueryCache", "is_query"]
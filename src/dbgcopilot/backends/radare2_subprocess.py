@@ -56,7 +56,7 @@ class Radare2SubprocessBackend:
     """Radare2 backend that proxies commands via r2pipe."""
 
     name = "radare2"
-    _EXIT_COMMANDS = {"quit", "q", "exit"}
+    _EXIT_COMMANDS = frozenset({"quit", "q", "exit"})
 
     def __init__(
         self,
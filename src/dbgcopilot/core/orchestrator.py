@@ -6,9 +6,10 @@ and manage session state. Currently a minimal placeholder.
 # pyright: reportUnknownMemberType=false, reportUnknownArgumentType=false, reportUnknownVariableType=false, reportUnknownParameterType=false, reportUnusedFunction=false
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import Optional, List, Any, Dict
 import re
-from dbgcopilot.core.state import Attempt, SessionState, resolve_auto_round_limit
+from dbgcopilot.core.state import Attempt, SessionState, recent_attempts, resolve_auto_round_limit
 from dbgcopilot.llm import providers
 from dbgcopilot.utils.io import head_tail_truncate, color_text, strip_ansi
 from pathlib import Path
@@ -17,6 +18,36 @@ import json
 from dbgcopilot.prompts.defaults import DEFAULT_PROMPT_CONFIG
 
 DEFAULT_MAX_CONTEXT_CHARS = int(DEFAULT_PROMPT_CONFIG.get("max_context_chars", 16000))
+# Plain answers remembered per orchestrator for repeated identical questions.
+ANSWER_CACHE_SIZE = 64
+
+_CMD_RE = re.compile(r"<cmd>\s*([\s\S]*?)\s*</cmd>", re.IGNORECASE)
+_CMD_BLOCK_RE = re.compile(r"<cmd>[\s\S]*?</cmd>", re.IGNORECASE)
+# The line boundaries str.splitlines() recognises.
+_LINE_BREAK_RE = re.compile("[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _first_line(text: str) -> str:
+    """Same as ``text.splitlines()[0]`` for non-empty text, without splitting the rest."""
+    match = _LINE_BREAK_RE.search(text)
+    return text[: match.start()] if match else text
+
+
+def _conversation_without(chatlog: list[str], question: str) -> tuple[str, ...]:
+    """``chatlog`` minus the ``User:``/``Assistant:`` pairs that asked ``question``."""
+    asked = f"User: {question}".lower()
+    kept: list[str] = []
+    skip_answer = False
+    for line in chatlog:
+        if skip_answer:
+            skip_answer = False
+            if line.startswith("Assistant: "):
+                continue
+        if line.lower() == asked:
+            skip_answer = True
+            continue
+        kept.append(line)
+    return tuple(kept)
 
 
 class CopilotOrchestrator:
@@ -34,6 +65,9 @@ class CopilotOrchestrator:
         # Load prompt config
         self.prompt_source = "defaults"
         self.prompt_config = self._load_prompt_config()
+        # (question key) -> (raw LLM answer, rendered reply); see _answer_cache_key.
+        self._answer_cache: OrderedDict[tuple[Any, ...], tuple[str, str]] = OrderedDict()
+        self._cacheable_answer: Optional[str] = None
 
     # ------------------------------------------------------------------
     # Auto-approve helpers
@@ -171,6 +205,7 @@ class CopilotOrchestrator:
 
     def reload_prompts(self) -> str:
         self.prompt_config = self._load_prompt_config()
+        self._answer_cache.clear()
         return f"Prompts reloaded from {self.prompt_source}."
 
     def get_prompt_config(self) -> dict[str, Any]:
@@ -182,7 +217,51 @@ class CopilotOrchestrator:
         text = (question or "").strip()
         if getattr(self.state, "pending_command", None):
             return self._handle_command_confirmation(text)
-        return self._llm_turn(text)
+        key = self._answer_cache_key(text)
+        if key is not None:
+            hit = self._answer_cache.get(key)
+            if hit is not None:
+                self._answer_cache.move_to_end(key)
+                answer, result = hit
+                self.state.last_answer_streamed = False
+                self._record_turn(text, answer)
+                return result
+        self._cacheable_answer = None
+        result = self._llm_turn(text)
+        answer, self._cacheable_answer = self._cacheable_answer, None
+        if key is not None and answer is not None:
+            self._answer_cache[key] = (answer, result)
+            if len(self._answer_cache) > ANSWER_CACHE_SIZE:
+                self._answer_cache.popitem(last=False)
+        return result
+
+    def _answer_cache_key(self, text: str) -> Optional[tuple[Any, ...]]:
+        """Key under which a plain answer to ``text`` may be reused, or None.
+
+        The key covers everything a repeat must not outlive: the debugger's
+        last output (any executed command replaces it), the conversation so far
+        apart from earlier asks of this same question, the goal, provider,
+        session config and colors. So an immediate repeat is served, but one
+        after other turns is answered afresh. Auto-approve turns are never
+        reused since they execute commands.
+        """
+        state = self.state
+        if not text or state.auto_accept_commands:
+            return None
+        return (
+            state.session_id,
+            text.lower(),
+            state.last_output,
+            _conversation_without(state.chatlog, text),
+            state.goal,
+            state.selected_provider,
+            frozenset(state.config.items()),
+            state.colors_enabled,
+        )
+
+    def _record_turn(self, question: str, answer: str) -> None:
+        self.state.chatlog.extend((f"User: {question}", f"Assistant: {answer.strip()}"))
+        self.state.facts.extend((f"Q: {question}", f"A: {(_first_line(answer) if answer else '').strip()}"))
 
     def _handle_command_confirmation(self, reply: str) -> str:
         cmd = self.state.pending_command
@@ -278,7 +357,7 @@ class CopilotOrchestrator:
         return "\n".join(parts)
 
     def _extract_explanation(self, raw_answer: str) -> str:
-        return re.sub(r"<cmd>[\s\S]*?</cmd>", "", raw_answer, flags=re.IGNORECASE).strip()
+        return _CMD_BLOCK_RE.sub("", raw_answer).strip()
 
     def _emit_chat(self, text: str, *, color: Optional[str] = "green") -> bool:
         if not text:
@@ -334,7 +413,7 @@ class CopilotOrchestrator:
                 self.state.facts.clear()
                 self.state.last_output = ""
                 if prev_summary:
-                    self.state.facts.append(f"Summary: {prev_summary.splitlines()[0][:160]}")
+                    self.state.facts.append(f"Summary: {_first_line(prev_summary)[:160]}")
                 return (
                     f"Started a new session: {self.state.session_id}\n"
                     "Here is a brief summary of the previous session for reference:\n"
@@ -356,7 +435,7 @@ class CopilotOrchestrator:
                 "current session and start a new one from that summary, or start a fresh session "
                 "without a summary? Reply with 'summarize and new session' or 'new session'."
             )
-        attempts = self.state.attempts[-5:]
+        attempts = recent_attempts(self.state.attempts, 5)
         attempts_txt = "\n".join(
             f"- {a.cmd}: {a.output_snippet}" for a in attempts if getattr(a, "output_snippet", "")
         )
@@ -401,19 +480,14 @@ class CopilotOrchestrator:
                         client = prov.ask
                     answer = client(primed_question)
 
-                    user_line = f"User: {question.strip()}"
-                    assistant_line = f"Assistant: {answer.strip()}"
-                    self.state.chatlog.append(user_line)
-                    self.state.chatlog.append(assistant_line)
-                    self.state.facts.append(f"Q: {question.strip()}")
-                    self.state.facts.append(f"A: {(answer.splitlines()[0] if answer else '').strip()}")
+                    self._record_turn(question.strip(), answer)
 
                     explanation = self._extract_explanation(answer)
                     display_text = (explanation or answer).strip()
                     auto_mode = getattr(self.state, "auto_accept_commands", False)
                     streamed = False
 
-                    match = re.search(r"<cmd>\s*([\s\S]*?)\s*</cmd>", answer, re.IGNORECASE)
+                    match = _CMD_RE.search(answer)
                     if match:
                         exec_cmd = match.group(1).strip()
                         if auto_mode:
@@ -452,6 +526,9 @@ class CopilotOrchestrator:
                     result = color_text(answer, "green", enable=colors) if colors else answer
                     if auto_mode and streamed and getattr(self.state, "last_answer_streamed", False):
                         return ""
+                    if not auto_mode and answer:
+                        # Plain answer, no command proposed: safe for ask() to reuse.
+                        self._cacheable_answer = answer
                     return result
                 except Exception as e:
                     msg = f"LLM provider error: {e}"
@@ -470,7 +547,7 @@ class CopilotOrchestrator:
         dbg = getattr(self.backend, "name", "debugger")
         provider = getattr(self.state, "selected_provider", "(none)")
         goal = (self.state.goal or "").strip()
-        attempts = self.state.attempts[-5:]
+        attempts = recent_attempts(self.state.attempts, 5)
         attempts_txt = "\n".join(f"  - {a.cmd}: {a.output_snippet[:120]}" for a in attempts if a.cmd)
 
         # Parse last few Q/A lines from facts
@@ -705,7 +782,7 @@ def _llm_summarize_session(self: "CopilotOrchestrator") -> str:
     Returns plain text. Falls back to local summary on provider errors.
     """
     goal = (self.state.goal or "").strip()
-    attempts = self.state.attempts[-5:]
+    attempts = recent_attempts(self.state.attempts, 5)
     attempts_txt = "\n".join(
         f"- {a.cmd}: {a.output_snippet}" for a in attempts if getattr(a, "output_snippet", "")
     )
@@ -739,7 +816,7 @@ def _execute_once(self: "CopilotOrchestrator", exec_cmd: str) -> tuple[str, bool
     colors = getattr(self.state, "colors_enabled", True)
     out = _execute_and_format(self.backend, exec_cmd, colors=colors)
     self.state.last_output = out
-    self.state.attempts.append(Attempt(cmd=exec_cmd, output_snippet=(out or "")[:160]))
+    self.state.attempts.append(Attempt.from_output(exec_cmd, out))
     self.state.chatlog.append(f"Assistant: (executed) {exec_cmd}\n" + (out or ""))
     streamed = False
     sink = getattr(self.state, "debugger_output_sink", None)
@@ -752,7 +829,7 @@ def _execute_once(self: "CopilotOrchestrator", exec_cmd: str) -> tuple[str, bool
     if out:
         if not streamed:
             self.state.pending_outputs.append(out)
-        self.state.facts.append(f"O: {out.splitlines()[0]}")
+        self.state.facts.append(f"O: {_first_line(out)}")
     return out, streamed
 
 
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from .state import SessionState
+from .state import SessionState, recent_attempts
 
 
 def build_markdown_report(state: SessionState) -> str:
@@ -21,7 +21,7 @@ def build_markdown_report(state: SessionState) -> str:
         lines.append("- (none yet)")
     if state.attempts:
         lines += ["", "## Commands Run"]
-        for a in state.attempts[-10:]:  # last 10
+        for a in recent_attempts(state.attempts, 10):
             lines.append(f"- `{a.cmd}`: {a.output_snippet[:120]}...")
     lines += ["", "## Next Steps", "- (TBD)"]
     return "\n".join(lines)
@@ -1,11 +1,19 @@
 """Session state scaffolding (POC)."""
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, Callable, List, Any, Dict, Mapping
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Callable, List, Any, Dict, Deque, Mapping
 
 
 DEFAULT_AUTO_ROUND_LIMIT = 64
+# Per-session history bounds; the oldest entries are dropped first.
+FACTS_LIMIT = 256
+ATTEMPTS_LIMIT = 128
+# Characters of command output kept on each Attempt.
+SNIPPET_LEN = 160
 
 
 def resolve_auto_round_limit(config: Mapping[str, str] | None) -> int:
@@ -23,18 +31,38 @@ def resolve_auto_round_limit(config: Mapping[str, str] | None) -> int:
                 return limit
     return DEFAULT_AUTO_ROUND_LIMIT
 
+
+@lru_cache(maxsize=512)
+def intern_snippet(snippet: str) -> str:
+    """Return one shared instance per distinct snippet (repeated `next`/`step` output)."""
+    return snippet
+
+
 @dataclass
 class Attempt:
     cmd: str
     output_snippet: str = ""
 
+    @classmethod
+    def from_output(cls, cmd: str, output: Optional[str]) -> "Attempt":
+        return cls(cmd=cmd, output_snippet=intern_snippet((output or "")[:SNIPPET_LEN]))
+
+
+def recent_attempts(attempts: Deque[Attempt], n: int) -> List[Attempt]:
+    """Return the last ``n`` attempts, oldest first (deques cannot be sliced)."""
+    return list(islice(attempts, max(len(attempts) - n, 0), None))
+
 
 def _new_str_list() -> List[str]:
     return []
 
 
-def _new_attempt_list() -> List[Attempt]:
-    return []
+def _new_fact_deque() -> Deque[str]:
+    return deque(maxlen=FACTS_LIMIT)
+
+
+def _new_attempt_deque() -> Deque[Attempt]:
+    return deque(maxlen=ATTEMPTS_LIMIT)
 
 
 def _new_config_dict() -> Dict[str, str]:
@@ -49,9 +77,9 @@ def _new_chat_event_list() -> List[Dict[str, Any]]:
 class SessionState:
     session_id: str
     goal: str = ""
-    facts: List[str] = field(default_factory=_new_str_list)
+    facts: Deque[str] = field(default_factory=_new_fact_deque)
     chatlog: List[str] = field(default_factory=_new_str_list)  # alternating User:/Assistant: lines
-    attempts: List[Attempt] = field(default_factory=_new_attempt_list)
+    attempts: Deque[Attempt] = field(default_factory=_new_attempt_deque)
     last_output: str = ""
     config: Dict[str, str] = field(default_factory=_new_config_dict)
     provider_name: str = "openrouter"
@@ -0,0 +1,135 @@
+"""On-disk response cache for LLM calls.
+
+Responses are keyed by a hash of ``provider|model|config|prompt``, where config
+is the session config minus credentials (so a different temperature or base URL
+misses), and stored in a small SQLite database, so identical prompts (re-runs,
+resumed sessions, repeated debugger states) are answered without another
+provider round-trip.
+Only exact matches are served; there is no fuzzy/semantic matching.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+
+class ExactCache:
+    """Thread-safe SQLite-backed map from prompt hash to response text."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, config: str = "") -> str:
+        return hashlib.blake2b(f"{provider}|{model}|{config}|{prompt}".encode("utf-8"), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cached_call(
+    ask_fn: Callable[[str], str],
+    cache: ExactCache,
+    provider: str,
+    model: str,
+    session_config: Optional[Mapping[str, Any]] = None,
+) -> Callable[[str], str]:
+    """Wrap ``ask_fn`` so identical prompts are served from ``cache``.
+
+    The wrapper exposes ``last_usage`` like the provider callables do. On a cache
+    hit it reports zero tokens and zero cost with ``cache_hit=True`` so usage
+    accounting reflects the saved call. ``session_config`` entries other than
+    API keys (temperature, base URL, ...) are part of the key. When ``ask_fn`` has a ``stream`` variant
+    the wrapper gets one too: a miss streams from the provider and stores the
+    text it yielded, a hit yields the cached text as a single chunk.
+    """
+
+    # Credentials do not change the response; keep them out of the key.
+    config = "|".join(
+        f"{k}={v}" for k, v in sorted((session_config or {}).items()) if not k.endswith("api_key")
+    )
+
+    def _hit_usage() -> Dict[str, Any]:
+        return {
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "cost": 0.0,
+            "cache_hit": True,
+        }
+
+    def ask(prompt: str) -> str:
+        key = cache.make_key(provider, model, prompt, config)
+        hit = cache.get(key)
+        if hit is not None:
+            setattr(ask, "last_usage", _hit_usage())
+            return hit
+        answer = ask_fn(prompt)
+        usage = dict(getattr(ask_fn, "last_usage", None) or {})
+        setattr(ask, "last_usage", usage)
+        if answer:
+            cache.put(key, answer)
+        return answer
+
+    setattr(ask, "last_usage", {})
+    stream_fn = getattr(ask_fn, "stream", None)
+    if stream_fn is None:
+        return ask
+
+    def stream(prompt: str) -> Iterator[str]:
+        key = cache.make_key(provider, model, prompt, config)
+        hit = cache.get(key)
+        if hit is not None:
+            setattr(ask, "last_usage", _hit_usage())
+            yield hit
+            return
+        parts: list[str] = []
+        chunks = stream_fn(prompt)
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            # The consumer stopped once it had what it needed; that text is the
+            # answer it acted on, so it is what a repeat of this prompt replays.
+            pass
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            setattr(ask, "last_usage", dict(getattr(ask_fn, "last_usage", None) or {}))
+        answer = "".join(parts)
+        if answer:
+            cache.put(key, answer)
+
+    setattr(ask, "stream", stream)
+    return ask
+
+
+__all__ = ["ExactCache", "cached_call"]
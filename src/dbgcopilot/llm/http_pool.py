@@ -0,0 +1,63 @@
+"""Process-wide HTTP connection pool for LLM providers.
+
+``requests.post``/``requests.get`` build a throwaway ``Session`` per call, so
+every LLM request paid a fresh TCP + TLS handshake. Providers instead go
+through one ``HTTPAdapter`` whose urllib3 pool keeps connections alive across
+calls, sessions and threads (dbgweb runs one worker thread per debugging
+session). ``requests.Session`` itself is not documented as thread-safe (it
+holds cookies and mutable defaults), so each thread gets its own Session with
+that shared adapter mounted.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+_POOL_CONNECTIONS = 16  # distinct hosts kept in the pool
+_POOL_MAXSIZE = 64  # concurrent connections per host
+
+_adapter: Optional[Any] = None
+# Bumped by close_session() so threads drop Sessions bound to the closed adapter.
+_generation = 0
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _shared_adapter() -> tuple[Any, int]:
+    global _adapter
+    with _lock:
+        if _adapter is None:
+            from requests.adapters import HTTPAdapter
+
+            _adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE)
+        return _adapter, _generation
+
+
+def get_session() -> Any:
+    """Return this thread's ``requests.Session`` on the shared pool, creating it on first use."""
+    local = _local
+    session = getattr(local, "session", None)
+    if session is not None and local.generation == _generation:
+        return session
+    import requests
+
+    adapter, generation = _shared_adapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    local.session, local.generation = session, generation
+    return session
+
+
+def close_session() -> None:
+    """Close pooled connections (e.g. on server shutdown); a later call reopens the pool."""
+    global _adapter, _generation
+    with _lock:
+        adapter, _adapter = _adapter, None
+        _generation += 1
+    # Per-thread Sessions hold nothing but the adapter; closing it frees the sockets.
+    if adapter is not None:
+        adapter.close()
+
+
+__all__ = ["close_session", "get_session"]
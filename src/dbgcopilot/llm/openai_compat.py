@@ -25,8 +25,9 @@ from __future__ import annotations
 import os
 import json
 import re
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable, Iterator
 
+from . import http_pool
 from . import params as param_utils
 
 
@@ -152,6 +153,15 @@ def _extract_usage(data: Dict[str, Any], provider_name: str, model: str) -> Dict
             val = _as_int(usage_obj.get(key))
             if val is not None:
                 usage[key] = val
+        # Prompt tokens served from the provider's prefix cache (OpenAI-style
+        # prompt_tokens_details, or DeepSeek's prompt_cache_hit_tokens).
+        details = usage_obj.get("prompt_tokens_details")
+        cached = details.get("cached_tokens") if isinstance(details, dict) else None
+        if cached is None:
+            cached = usage_obj.get("prompt_cache_hit_tokens")
+        cached_int = _as_int(cached)
+        if cached_int is not None:
+            usage["cached_tokens"] = cached_int
         for cost_key in ("total_cost", "total_cost_usd", "cost"):
             val = _as_float(usage_obj.get(cost_key))
             if val is not None:
@@ -161,18 +171,14 @@ def _extract_usage(data: Dict[str, Any], provider_name: str, model: str) -> Dict
     return usage
 
 
-def _ask_openai_compat(
+def _prepare_request(
     prompt: str,
     name: str,
     session_config: Optional[dict[str, Any]] = None,
     defaults: Optional[Dict[str, Any]] = None,
     meta: Optional[Dict[str, Any]] = None,
-) -> Tuple[str, Dict[str, Any]]:
-    try:
-        import requests
-    except Exception as e:
-        raise RuntimeError("requests library is required for OpenAI-compatible providers") from e
-
+) -> Tuple[str, Dict[str, str], Dict[str, Any], str]:
+    """Return ``(url, headers, body, model)`` for a chat completion request."""
     cfg = _get_cfg(name, session_config, defaults=defaults)
     base_url = (cfg.get("base_url") or "").rstrip("/")
     api_key = cfg.get("api_key")
@@ -219,9 +225,25 @@ def _ask_openai_compat(
 
     session_params = param_utils.get_session_params(session_config or {}, name)
     body = param_utils.apply_params(body, session_params, meta, assume_canonical=True)
+    return url, headers, body, model
+
+
+def _ask_openai_compat(
+    prompt: str,
+    name: str,
+    session_config: Optional[dict[str, Any]] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    try:
+        import requests  # noqa: F401  # calls go through http_pool; fail early if missing
+    except Exception as e:
+        raise RuntimeError("requests library is required for OpenAI-compatible providers") from e
+
+    url, headers, body, model = _prepare_request(prompt, name, session_config, defaults, meta)
 
     try:
-        resp = requests.post(url, headers=headers, json=body, timeout=20)
+        resp = http_pool.get_session().post(url, headers=headers, json=body, timeout=20)
     except Exception as e:
         raise RuntimeError(f"{name} request failed: {e}") from e
 
@@ -254,6 +276,67 @@ def _ask_openai_compat(
     return content, usage
 
 
+def iter_sse_chunks(resp: Any) -> Iterator[Dict[str, Any]]:
+    """Yield decoded JSON events from a streamed (``stream=True``) chat completion."""
+    for raw in resp.iter_lines(decode_unicode=True):
+        if not raw or not raw.startswith("data:"):
+            continue
+        data = raw[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            yield event
+
+
+def _stream_openai_compat(
+    prompt: str,
+    name: str,
+    on_usage: Callable[[Dict[str, Any]], None],
+    session_config: Optional[dict[str, Any]] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """Yield content deltas of a streamed completion.
+
+    Closing the generator early closes the HTTP response, which ends generation
+    server-side. Usage arrives in the final event, so an aborted stream only
+    reports provider and model through ``on_usage``.
+    """
+    try:
+        import requests  # noqa: F401  # calls go through http_pool; fail early if missing
+    except Exception as e:
+        raise RuntimeError("requests library is required for OpenAI-compatible providers") from e
+
+    url, headers, body, model = _prepare_request(prompt, name, session_config, defaults, meta)
+    body["stream"] = True
+    body["stream_options"] = {"include_usage": True}
+    headers["Accept"] = "text/event-stream"
+    on_usage({"provider": name, "model": model})
+
+    try:
+        resp = http_pool.get_session().post(url, headers=headers, json=body, timeout=20, stream=True)
+    except Exception as e:
+        raise RuntimeError(f"{name} request failed: {e}") from e
+
+    with resp:
+        if not (200 <= resp.status_code < 300):
+            snippet = (resp.text or "")[:200].replace("\n", " ")
+            raise RuntimeError(f"{name} HTTP {resp.status_code} for {url}: {snippet}")
+        for event in iter_sse_chunks(resp):
+            if isinstance(event.get("usage"), dict):
+                on_usage(_extract_usage(event, name, model))
+            try:
+                delta = event["choices"][0]["delta"].get("content")
+            except (KeyError, IndexError, TypeError, AttributeError):
+                continue
+            if delta:
+                yield delta
+
+
 def create_provider(
     session_config: dict[str, Any] | None = None,
     name: str = "openai-http",
@@ -279,7 +362,19 @@ def create_provider(
         setattr(ask, "last_usage", usage)
         return content
 
+    def stream(prompt: str) -> Iterator[str]:
+        """Streaming variant of ``ask``; yields content deltas as they arrive."""
+        yield from _stream_openai_compat(
+            prompt,
+            name=name,
+            on_usage=lambda usage: setattr(ask, "last_usage", usage),
+            session_config=session_config,
+            defaults=defaults,
+            meta=meta_payload,
+        )
+
     setattr(ask, "last_usage", {})
+    setattr(ask, "stream", stream)
     return ask
 
 
@@ -296,7 +391,7 @@ def list_models(
     - On error, return [] and allow REPLs to show a helpful message
     """
     try:
-        import requests
+        import requests  # noqa: F401  # calls go through http_pool; fail early if missing
     except Exception as e:
         raise RuntimeError("requests library is required to list models for OpenAI-compatible providers") from e
 
@@ -316,7 +411,7 @@ def list_models(
             url = f"{base_url.rstrip('/')}/models"
         else:
             url = f"{base_url}/v1/models"
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = http_pool.get_session().get(url, headers=headers, timeout=15)
         if 200 <= resp.status_code < 300:
             try:
                 data = resp.json()
@@ -336,7 +431,7 @@ def list_models(
     if name == "ollama":
         try:
             url = f"{base_url}/api/tags"
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = http_pool.get_session().get(url, headers=headers, timeout=15)
             if 200 <= resp.status_code < 300:
                 try:
                     data = resp.json() or {}
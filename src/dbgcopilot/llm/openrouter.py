@@ -13,9 +13,11 @@ from __future__ import annotations
 
 import os
 import json
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Callable, Iterator
 
+from . import http_pool
 from . import params as param_utils
+from .openai_compat import iter_sse_chunks
 
 
 def _get_api_key(meta: dict[str, Any] | None = None, session_config: dict[str, Any] | None = None) -> Optional[str]:
@@ -52,6 +54,15 @@ def _extract_usage(data: Dict[str, Any], model: str) -> Dict[str, Any]:
             iv = _as_int(usage_obj.get(key))
             if iv is not None:
                 usage[key] = iv
+        # Prompt tokens served from the provider's prefix cache (OpenAI-style
+        # prompt_tokens_details, or DeepSeek's prompt_cache_hit_tokens).
+        details = usage_obj.get("prompt_tokens_details")
+        cached = details.get("cached_tokens") if isinstance(details, dict) else None
+        if cached is None:
+            cached = usage_obj.get("prompt_cache_hit_tokens")
+        cached_int = _as_int(cached)
+        if cached_int is not None:
+            usage["cached_tokens"] = cached_int
         # OpenRouter may return cost fields under different keys
         for cost_key in ("total_cost", "total_cost_usd", "cost"):
             fv = _as_float(usage_obj.get(cost_key))
@@ -66,17 +77,12 @@ def _extract_usage(data: Dict[str, Any], model: str) -> Dict[str, Any]:
     return usage
 
 
-def _ask_openrouter(
+def _prepare_request(
     prompt: str,
     meta: dict[str, Any] | None = None,
     session_config: dict[str, Any] | None = None,
-) -> Tuple[str, Dict[str, Any]]:
-    # Lazy import to avoid adding hard runtime deps for tests
-    try:
-        import requests
-    except Exception as e:
-        raise RuntimeError("requests library is required for OpenRouter provider") from e
-
+) -> Tuple[str, Dict[str, str], Dict[str, Any], str]:
+    """Return ``(url, headers, body, model)`` for an OpenRouter chat completion."""
     key = _get_api_key(meta, session_config)
     if not key:
         raise RuntimeError(
@@ -135,9 +141,24 @@ def _ask_openrouter(
     provider_name = str(meta.get("name") or "openrouter")
     session_params = param_utils.get_session_params(session_config or {}, provider_name)
     body = param_utils.apply_params(body, session_params, meta, assume_canonical=True)
+    return url, headers, body, model
 
+
+def _ask_openrouter(
+    prompt: str,
+    meta: dict[str, Any] | None = None,
+    session_config: dict[str, Any] | None = None,
+) -> Tuple[str, Dict[str, Any]]:
+    # Lazy import to avoid adding hard runtime deps for tests
     try:
-        resp = requests.post(url, headers=headers, json=body, timeout=20)
+        import requests  # noqa: F401  # calls go through http_pool; fail early if missing
+    except Exception as e:
+        raise RuntimeError("requests library is required for OpenRouter provider") from e
+
+    url, headers, body, model = _prepare_request(prompt, meta, session_config)
+
+    try:
+        resp = http_pool.get_session().post(url, headers=headers, json=body, timeout=20)
     except Exception as e:  # requests.RequestException in most cases
         raise RuntimeError(f"OpenRouter request failed: {e}") from e
 
@@ -164,6 +185,44 @@ def _ask_openrouter(
     return content, usage
 
 
+def _stream_openrouter(
+    prompt: str,
+    on_usage: Callable[[Dict[str, Any]], None],
+    meta: dict[str, Any] | None = None,
+    session_config: dict[str, Any] | None = None,
+) -> Iterator[str]:
+    """Yield content deltas of a streamed completion; closing early aborts the request."""
+    try:
+        import requests  # noqa: F401  # calls go through http_pool; fail early if missing
+    except Exception as e:
+        raise RuntimeError("requests library is required for OpenRouter provider") from e
+
+    url, headers, body, model = _prepare_request(prompt, meta, session_config)
+    body["stream"] = True
+    body["stream_options"] = {"include_usage": True}
+    headers["Accept"] = "text/event-stream"
+    on_usage({"provider": "openrouter", "model": model})
+
+    try:
+        resp = http_pool.get_session().post(url, headers=headers, json=body, timeout=20, stream=True)
+    except Exception as e:
+        raise RuntimeError(f"OpenRouter request failed: {e}") from e
+
+    with resp:
+        if not (200 <= resp.status_code < 300):
+            snippet = (resp.text or "").strip()[:200].replace("\n", " ")
+            raise RuntimeError(f"OpenRouter HTTP {resp.status_code}: {snippet}")
+        for event in iter_sse_chunks(resp):
+            if isinstance(event.get("usage"), dict):
+                on_usage(_extract_usage(event, model))
+            try:
+                delta = event["choices"][0]["delta"].get("content")
+            except (KeyError, IndexError, TypeError, AttributeError):
+                continue
+            if delta:
+                yield delta
+
+
 def create_provider(session_config: dict[str, Any] | None = None, meta: dict[str, Any] | None = None):
     # Returns a callable that accepts prompt and returns string
     meta = meta or {}
@@ -173,7 +232,17 @@ def create_provider(session_config: dict[str, Any] | None = None, meta: dict[str
         setattr(ask, "last_usage", usage)
         return content
 
+    def stream(prompt: str) -> Iterator[str]:
+        """Streaming variant of ``ask``; yields content deltas as they arrive."""
+        yield from _stream_openrouter(
+            prompt,
+            on_usage=lambda usage: setattr(ask, "last_usage", usage),
+            meta=meta,
+            session_config=session_config,
+        )
+
     setattr(ask, "last_usage", {})
+    setattr(ask, "stream", stream)
     return ask
 
 
@@ -183,7 +252,7 @@ def list_models(session_config: dict[str, Any] | None = None) -> list[str]:
     Tries the public models endpoint; if an API key is available, it will be sent.
     """
     try:
-        import requests
+        import requests  # noqa: F401  # calls go through http_pool; fail early if missing
     except Exception as e:
         raise RuntimeError("requests library is required to list OpenRouter models") from e
 
@@ -196,7 +265,7 @@ def list_models(session_config: dict[str, Any] | None = None) -> list[str]:
         headers["Authorization"] = f"Bearer {key}"
 
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = http_pool.get_session().get(url, headers=headers, timeout=15)
     except Exception as e:
         raise RuntimeError(f"OpenRouter models request failed: {e}") from e
 
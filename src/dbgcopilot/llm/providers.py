@@ -219,6 +219,10 @@ class Provider:
 
 _config_cache: Optional[Dict[str, Any]] = None
 _registry: Dict[str, Provider] = {}
+# Sorted provider names, captured with each rebuild.
+_provider_names: tuple[str, ...] = ()
+# Bumped on every registry rebuild so callers can cache derived data.
+_registry_generation = 0
 
 
 def _repo_root() -> Path:
@@ -351,8 +355,10 @@ def _rebuild_registry() -> None:
         if provider is None:
             continue
         registry[name] = provider
-    global _registry
+    global _registry, _registry_generation, _provider_names
     _registry = registry
+    _provider_names = tuple(registry)  # built in sorted order above
+    _registry_generation += 1
 
 
 def _ensure_registry() -> None:
@@ -367,7 +373,13 @@ def reload() -> None:
 
 def list_providers() -> list[str]:
     _ensure_registry()
-    return sorted(_registry.keys())
+    return list(_provider_names)
+
+
+def registry_generation() -> int:
+    """Return a counter that changes whenever the provider registry is rebuilt."""
+    _ensure_registry()
+    return _registry_generation
 
 
 def get_provider(name: str) -> Optional[Provider]:
@@ -475,6 +487,7 @@ __all__ = [
     "list_models",
     "list_providers",
     "provider_config",
+    "registry_generation",
     "reload",
     "set_provider_field",
 ]
@@ -40,20 +40,34 @@ def _ensure_paths():  # pragma: no cover - depends on runtime
 
 _ensure_paths()
 
-from dbgcopilot.core.state import SessionState, Attempt
-from dbgcopilot.core.orchestrator import CopilotOrchestrator
-from dbgcopilot.backends.gdb_inprocess import GdbInProcessBackend
 
-
-# Globals kept in this module for REPL/state access
+# Globals kept in this module for REPL/state access. They stay None until the
+# first `copilot` command so that merely loading the plugin into gdb does not
+# import the orchestrator and LLM stack.
 SESSION = None  # type: ignore
 ORCH = None  # type: ignore
-BACKEND = GdbInProcessBackend()
+BACKEND = None  # type: ignore
+SessionState = None  # type: ignore
+CopilotOrchestrator = None  # type: ignore
+
+
+def _load_copilot():  # pragma: no cover - gdb environment
+    """Import the copilot core on first use and create the gdb backend."""
+    global BACKEND, SessionState, CopilotOrchestrator
+    if BACKEND is None:
+        from dbgcopilot.core.state import SessionState as _SessionState
+        from dbgcopilot.core.orchestrator import CopilotOrchestrator as _CopilotOrchestrator
+        from dbgcopilot.backends.gdb_inprocess import GdbInProcessBackend
+
+        SessionState = _SessionState
+        CopilotOrchestrator = _CopilotOrchestrator
+        BACKEND = GdbInProcessBackend()
 
 
 def _ensure_session():  # pragma: no cover - gdb environment
     """Ensure a session exists. Create one lazily if missing."""
     global SESSION, ORCH
+    _load_copilot()
     if SESSION is None:
         sid = str(uuid.uuid4())[:8]
         SESSION = SessionState(session_id=sid)
@@ -77,6 +91,7 @@ if gdb is not None:  # pragma: no cover - only define the command inside gdb
             args = (arg or "").strip()
             if args == "new":
                 # force new session
+                _load_copilot()
                 sid = str(uuid.uuid4())[:8]
                 SESSION = SessionState(session_id=sid)
                 ORCH = CopilotOrchestrator(BACKEND, SESSION)
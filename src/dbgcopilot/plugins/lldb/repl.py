@@ -12,6 +12,7 @@ except Exception:  # pragma: no cover
 
 from dbgcopilot.core.orchestrator import CopilotOrchestrator
 from dbgcopilot.core.state import SessionState, Attempt
+from dbgcopilot.utils.io import line_reader
 
 
 def _ctx():  # pragma: no cover - lldb environment
@@ -40,15 +41,197 @@ def _print_help():
     return "\n".join(lines)
 
 
+def _do_help(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    print(_print_help())
+
+
+def _do_new(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    import uuid as _uuid
+    sid = str(_uuid.uuid4())[:8]
+    from .copilot_cmd import SESSION as GLOBAL_SESSION, ORCH as GLOBAL_ORCH, BACKEND as GLOBAL_BACKEND
+    new_s = SessionState(session_id=sid)
+    globals_mod = __import__("dbgcopilot.plugins.lldb.copilot_cmd", fromlist=["SESSION", "ORCH"])
+    setattr(globals_mod, "SESSION", new_s)
+    setattr(globals_mod, "ORCH", CopilotOrchestrator(GLOBAL_BACKEND, new_s))
+    GLOBAL_BACKEND.initialize_session()
+    print(f"[copilot] New session: {sid}")
+
+
+def _do_chatlog(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    if not SESSION.chatlog:
+        print("[copilot] No chat yet.")
+    else:
+        for line in SESSION.chatlog[-200:]:
+            print(line)
+
+
+def _do_prompts(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    sub = arg.strip().lower()
+    if sub == "show":
+        try:
+            cfg = ORCH.get_prompt_config()
+            import json as _json
+            src = cfg.get("_source", "defaults")
+            txt = _json.dumps(cfg, indent=2, ensure_ascii=False)
+            print(f"[copilot] Prompt source: {src}")
+            print(txt)
+        except Exception as e:
+            print(f"[copilot] Error showing prompts: {e}")
+    elif sub == "reload":
+        try:
+            msg = ORCH.reload_prompts()
+            print(msg)
+        except Exception as e:
+            print(f"[copilot] Error reloading prompts: {e}")
+    else:
+        print("Usage: /prompts show | /prompts reload")
+
+
+def _do_config(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    print(f"[copilot] Config: {SESSION.config}")
+    print(f"[copilot] Selected provider: {SESSION.selected_provider}")
+    print("[copilot] Agent automation now lives in the dbgagent tool.")
+
+
+def _do_agent(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    print("[copilot] Agent mode has moved to the new dbgagent tool.")
+
+
+def _do_exec(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    if not arg:
+        print("[copilot] Usage: /exec <lldb-cmd>")
+    else:
+        out = BACKEND.run_command(arg)
+        SESSION.last_output = out
+        SESSION.attempts.append(Attempt.from_output(arg, out))
+        # Echo similarly to gdb> style for parity
+        print(f"lldb> {arg}")
+        print(out)
+
+
+def _do_llm(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    # Reuse the same /llm handling as GDB REPL for consistency
+    parts2 = arg.split() if arg else []
+    action = parts2[0] if parts2 else ""
+    from dbgcopilot.llm import providers as _prov
+    sel = SESSION.selected_provider
+    if action == "list":
+        print("Available LLM providers:")
+        for p in _prov.list_providers():
+            print(f"- {p}")
+    elif action == "use" and len(parts2) >= 2:
+        name = parts2[1]
+        if _prov.get_provider(name) is None:
+            print(f"[copilot] Unknown provider: {name}")
+        else:
+            SESSION.selected_provider = name
+            print(f"[copilot] Selected provider: {name}")
+    elif action == "models":
+        provider = parts2[1] if len(parts2) >= 2 else (sel or "")
+        if not provider:
+            print("[copilot] No provider selected. Use /llm use <name> first or pass a provider.")
+        elif provider == "openrouter":
+            try:
+                from dbgcopilot.llm import openrouter as _or
+                models = _or.list_models(SESSION.config)
+                if not models:
+                    print("[copilot] No models returned. You may need to set an API key.")
+                else:
+                    print("OpenRouter models:")
+                    for m in models:
+                        print(f"- {m}")
+            except Exception as e:
+                print(f"[copilot] Error listing models: {e}")
+        elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "modelscope"}:
+            try:
+                from dbgcopilot.llm import openai_compat as _oa
+                models = _oa.list_models(SESSION.config, name=provider)
+                if not models:
+                    print(f"[copilot] No models returned from {provider}. Some providers do not support model listing via API; you can still set a model with /llm model.")
+                else:
+                    print(f"{provider} models:")
+                    for m in models:
+                        print(f"- {m}")
+            except Exception as e:
+                print(f"[copilot] Error listing models for {provider}: {e}")
+        else:
+            print(f"[copilot] Model listing not supported for provider: {provider}")
+    elif action == "model":
+        if len(parts2) == 2:
+            provider = sel
+            model = parts2[1]
+        elif len(parts2) >= 3:
+            provider = parts2[1]
+            model = " ".join(parts2[2:])
+        else:
+            provider = None
+            model = None
+        if not provider or not model:
+            print("Usage: /llm model [provider] <model>")
+        elif provider == "openrouter":
+            SESSION.config["openrouter_model"] = model
+            print(f"[copilot] OpenRouter model set to: {model}")
+        elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "modelscope"}:
+            key = provider.replace("-", "_") + "_model"
+            SESSION.config[key] = model
+            print(f"[copilot] {provider} model set to: {model}")
+        else:
+            print(f"[copilot] Setting model not supported for provider: {provider}")
+    elif action == "key":
+        if len(parts2) >= 3:
+            provider = parts2[1]
+            api_key = " ".join(parts2[2:]).strip()
+            if provider == "openrouter":
+                if api_key:
+                    SESSION.config["openrouter_api_key"] = api_key
+                    print("[copilot] OpenRouter API key set for this session.")
+                else:
+                    print("[copilot] Missing API key.")
+            elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "modelscope"}:
+                if api_key:
+                    key = provider.replace("-", "_") + "_api_key"
+                    SESSION.config[key] = api_key
+                    print(f"[copilot] {provider} API key set for this session.")
+                else:
+                    print("[copilot] Missing API key.")
+            else:
+                print(f"[copilot] API key setting not supported for provider: {provider}")
+        else:
+            print("Usage: /llm key <provider> <api_key>")
+    else:
+        print(
+            "Usage: /llm list | /llm use <name> | /llm models [provider] | /llm model [provider] <model> | /llm key <provider> <api_key>"
+        )
+
+
+def _do_unknown(arg, ORCH, SESSION, BACKEND):  # pragma: no cover - lldb environment
+    print("[copilot] Unknown slash command. Try /help")
+
+
+# Slash-command verb -> handler, built once at import.
+_HANDLERS = {
+    "/help": _do_help,
+    "/h": _do_help,
+    "/new": _do_new,
+    "/chatlog": _do_chatlog,
+    "/prompts": _do_prompts,
+    "/config": _do_config,
+    "/agent": _do_agent,
+    "/exec": _do_exec,
+    "/llm": _do_llm,
+}
+
+
 def start_repl():  # pragma: no cover - lldb environment
     ORCH, SESSION, BACKEND = _ctx()
     if ORCH is None or SESSION is None:
         print("[copilot] No active session.")
         return
     print("[copilot] Entering copilot> (type '/help' or 'exit' to leave)")
+    read_line = line_reader()
     while True:
         try:
-            line = input("copilot> ")
+            line = read_line("copilot> ")
         except EOFError:
             break
         cmd = (line or "").strip()
@@ -61,157 +244,7 @@ def start_repl():  # pragma: no cover - lldb environment
             parts = cmd.split(maxsplit=1)
             verb = parts[0].lower()
             arg = parts[1] if len(parts) > 1 else ""
-            if verb in ("/help", "/h"):
-                print(_print_help())
-            elif verb == "/new":
-                import uuid as _uuid
-                sid = str(_uuid.uuid4())[:8]
-                from .copilot_cmd import SESSION as GLOBAL_SESSION, ORCH as GLOBAL_ORCH, BACKEND as GLOBAL_BACKEND
-                new_s = SessionState(session_id=sid)
-                globals_mod = __import__("dbgcopilot.plugins.lldb.copilot_cmd", fromlist=["SESSION", "ORCH"])
-                setattr(globals_mod, "SESSION", new_s)
-                setattr(globals_mod, "ORCH", CopilotOrchestrator(GLOBAL_BACKEND, new_s))
-                GLOBAL_BACKEND.initialize_session()
-                print(f"[copilot] New session: {sid}")
-            
-            elif verb == "/chatlog":
-                if not SESSION.chatlog:
-                    print("[copilot] No chat yet.")
-                else:
-                    for line in SESSION.chatlog[-200:]:
-                        print(line)
-            elif verb == "/prompts":
-                sub = arg.strip().lower()
-                if sub == "show":
-                    try:
-                        cfg = ORCH.get_prompt_config()
-                        import json as _json
-                        src = cfg.get("_source", "defaults")
-                        txt = _json.dumps(cfg, indent=2, ensure_ascii=False)
-                        print(f"[copilot] Prompt source: {src}")
-                        print(txt)
-                    except Exception as e:
-                        print(f"[copilot] Error showing prompts: {e}")
-                elif sub == "reload":
-                    try:
-                        msg = ORCH.reload_prompts()
-                        print(msg)
-                    except Exception as e:
-                        print(f"[copilot] Error reloading prompts: {e}")
-                else:
-                    print("Usage: /prompts show | /prompts reload")
-            elif verb == "/config":
-                print(f"[copilot] Config: {SESSION.config}")
-                print(f"[copilot] Selected provider: {SESSION.selected_provider}")
-                print("[copilot] Agent automation now lives in the dbgagent tool.")
-            elif verb == "/agent":
-                print("[copilot] Agent mode has moved to the new dbgagent tool.")
-            elif verb == "/exec":
-                if not arg:
-                    print("[copilot] Usage: /exec <lldb-cmd>")
-                else:
-                    out = BACKEND.run_command(arg)
-                    SESSION.last_output = out
-                    SESSION.attempts.append(Attempt(cmd=arg, output_snippet=out[:160]))
-                    # Echo similarly to gdb> style for parity
-                    print(f"lldb> {arg}")
-                    print(out)
-            
-            elif verb == "/llm":
-                # Reuse the same /llm handling as GDB REPL for consistency
-                parts2 = arg.split() if arg else []
-                action = parts2[0] if parts2 else ""
-                from dbgcopilot.llm import providers as _prov
-                sel = SESSION.selected_provider
-                if action == "list":
-                    print("Available LLM providers:")
-                    for p in _prov.list_providers():
-                        print(f"- {p}")
-                elif action == "use" and len(parts2) >= 2:
-                    name = parts2[1]
-                    if _prov.get_provider(name) is None:
-                        print(f"[copilot] Unknown provider: {name}")
-                    else:
-                        SESSION.selected_provider = name
-                        print(f"[copilot] Selected provider: {name}")
-                elif action == "models":
-                    provider = parts2[1] if len(parts2) >= 2 else (sel or "")
-                    if not provider:
-                        print("[copilot] No provider selected. Use /llm use <name> first or pass a provider.")
-                    elif provider == "openrouter":
-                        try:
-                            from dbgcopilot.llm import openrouter as _or
-                            models = _or.list_models(SESSION.config)
-                            if not models:
-                                print("[copilot] No models returned. You may need to set an API key.")
-                            else:
-                                print("OpenRouter models:")
-                                for m in models:
-                                    print(f"- {m}")
-                        except Exception as e:
-                            print(f"[copilot] Error listing models: {e}")
-                    elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "modelscope"}:
-                        try:
-                            from dbgcopilot.llm import openai_compat as _oa
-                            models = _oa.list_models(SESSION.config, name=provider)
-                            if not models:
-                                print(f"[copilot] No models returned from {provider}. Some providers do not support model listing via API; you can still set a model with /llm model.")
-                            else:
-                                print(f"{provider} models:")
-                                for m in models:
-                                    print(f"- {m}")
-                        except Exception as e:
-                            print(f"[copilot] Error listing models for {provider}: {e}")
-                    else:
-                        print(f"[copilot] Model listing not supported for provider: {provider}")
-                elif action == "model":
-                    if len(parts2) == 2:
-                        provider = sel
-                        model = parts2[1]
-                    elif len(parts2) >= 3:
-                        provider = parts2[1]
-                        model = " ".join(parts2[2:])
-                    else:
-                        provider = None
-                        model = None
-                    if not provider or not model:
-                        print("Usage: /llm model [provider] <model>")
-                    elif provider == "openrouter":
-                        SESSION.config["openrouter_model"] = model
-                        print(f"[copilot] OpenRouter model set to: {model}")
-                    elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "modelscope"}:
-                        key = provider.replace("-", "_") + "_model"
-                        SESSION.config[key] = model
-                        print(f"[copilot] {provider} model set to: {model}")
-                    else:
-                        print(f"[copilot] Setting model not supported for provider: {provider}")
-                elif action == "key":
-                    if len(parts2) >= 3:
-                        provider = parts2[1]
-                        api_key = " ".join(parts2[2:]).strip()
-                        if provider == "openrouter":
-                            if api_key:
-                                SESSION.config["openrouter_api_key"] = api_key
-                                print("[copilot] OpenRouter API key set for this session.")
-                            else:
-                                print("[copilot] Missing API key.")
-                        elif provider in {"openai-http", "ollama", "deepseek", "qwen", "kimi", "zhipuglm", "modelscope"}:
-                            if api_key:
-                                key = provider.replace("-", "_") + "_api_key"
-                                SESSION.config[key] = api_key
-                                print(f"[copilot] {provider} API key set for this session.")
-                            else:
-                                print("[copilot] Missing API key.")
-                        else:
-                            print(f"[copilot] API key setting not supported for provider: {provider}")
-                    else:
-                        print("Usage: /llm key <provider> <api_key>")
-                else:
-                    print(
-                        "Usage: /llm list | /llm use <name> | /llm models [provider] | /llm model [provider] <model> | /llm key <provider> <api_key>"
-                    )
-            else:
-                print("[copilot] Unknown slash command. Try /help")
+            _HANDLERS.get(verb, _do_unknown)(arg, ORCH, SESSION, BACKEND)
             continue
 
         # Natural language to orchestrator.ask
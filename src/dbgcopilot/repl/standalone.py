@@ -1023,7 +1023,7 @@ def main(argv: Optional[list[str]] = None) -> int:
                     except Exception as e:
                         out = f"Error: {e}"
                     s.last_output = out
-                    s.attempts.append(Attempt(cmd=arg, output_snippet=(out or "")[:160]))
+                    s.attempts.append(Attempt.from_output(arg, out))
                     if out:
                         _echo(out)
                 continue
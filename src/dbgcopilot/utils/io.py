@@ -5,12 +5,19 @@ ANSI color helpers for optional colored output in REPL and summaries.
 from __future__ import annotations
 
 import re
+import sys
+from typing import Callable
 
 
 ANSI_RE = re.compile(r"\x1b(?:\[[0-9;?]*[ -/]*[@-~]|[@-~])")
 
 
 def strip_ansi(s: str) -> str:
+    # Every sequence ANSI_RE matches starts with ESC; plain output skips the regex.
+    # Either way ``s`` itself is returned (no copy) when nothing is stripped:
+    # Pattern.sub hands back its input object when it makes no substitution.
+    if "\x1b" not in s:
+        return s
     return ANSI_RE.sub("", s)
 
 
@@ -21,6 +28,34 @@ def head_tail_truncate(s: str, max_chars: int = 20000) -> str:
     tail = s[-max_chars // 2 :]
     return head + "\n... [truncated] ...\n" + tail
 
+
+def line_reader() -> Callable[[str], str]:
+    """Return a prompt-and-read callable for a REPL loop; raises EOFError at end of input.
+
+    Interactive terminals keep ``input()`` for line editing and history. Piped
+    or scripted stdin gets a plain write/flush + ``readline()``, skipping the
+    readline and signal handling ``input()`` repeats on every call.
+    """
+    stdin = sys.stdin
+    try:
+        interactive = stdin is None or stdin.isatty()
+    except Exception:
+        interactive = True
+    if interactive:
+        return input
+    stdout = sys.stdout
+
+    def read(prompt: str) -> str:
+        stdout.write(prompt)
+        stdout.flush()
+        line = stdin.readline()
+        if not line:
+            raise EOFError
+        return line[:-1] if line.endswith("\n") else line
+
+    return read
+
+
 # Basic ANSI color codes
 _CODES = {
     "reset": "\033[0m",
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import shutil
 import sys
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, Optional
 
 DEBUGGER_INSTALL_DOC = "https://github.com/oldzhu/dbgcopilot/blob/main/docs/install.md#prerequisites"
 
@@ -16,14 +17,20 @@ DEBUGGER_EXECUTABLES: dict[str, str] = {
 }
 
 
-def missing_debugger_tools() -> list[str]:
-    """Return the debugger executables that are not on PATH."""
-    return [name for name in DEBUGGER_EXECUTABLES if shutil.which(name) is None]
+@lru_cache(maxsize=None)
+def _on_path(name: str) -> bool:
+    # PATH does not change under a running CLI, so each binary is probed once per process.
+    return shutil.which(name) is not None
 
 
-def warn_missing_debugger_tools(context: str = "dbg") -> None:
-    """Print a reminder if any debugger binary is missing."""
-    missing = missing_debugger_tools()
+def missing_debugger_tools(names: Optional[Iterable[str]] = None) -> list[str]:
+    """Return the debugger executables (default: all known) that are not on PATH."""
+    return [name for name in (DEBUGGER_EXECUTABLES if names is None else names) if not _on_path(name)]
+
+
+def warn_missing_debugger_tools(context: str = "dbg", names: Optional[Iterable[str]] = None) -> None:
+    """Print a reminder if any debugger binary in ``names`` (default: all known) is missing."""
+    missing = missing_debugger_tools(names)
     if not missing:
         return
     names = ", ".join(sorted(missing))
@@ -1,28 +1,32 @@
 """REST endpoints for dbgweb."""
 from __future__ import annotations
 
+import json
+import os
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 
 from dbgcopilot.llm import providers as provider_registry
 
 from ..services.session_manager import session_manager
 
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
+
+# Workspace root for the file browser, resolved once at import.
+_WORKSPACE_BASE = Path.cwd().resolve()
 
 
 @router.get("/status")
-async def api_status() -> JSONResponse:
-    return JSONResponse({"status": "ok"})
+async def api_status() -> ORJSONResponse:
+    return ORJSONResponse({"status": "ok"})
 
 
-@router.get("/providers")
-async def list_providers() -> JSONResponse:
+def _build_providers_payload() -> bytes:
     items: List[Dict[str, Any]] = []
-    for name in sorted(provider_registry.list_providers()):
+    for name in provider_registry.list_providers():
         info = provider_registry.get_provider(name)
         meta = info.meta if info else {}
         default_model = ""
@@ -47,11 +51,30 @@ async def list_providers() -> JSONResponse:
                 "kind": kind,
             }
         )
-    return JSONResponse({"providers": items})
+    return json.dumps({"providers": items}).encode("utf-8")
+
+
+# (registry generation, serialized payload); rebuilt only when the registry changes.
+_providers_payload_cache: Optional[Tuple[int, bytes]] = None
+
+
+def _providers_payload() -> bytes:
+    global _providers_payload_cache
+    generation = provider_registry.registry_generation()
+    cached = _providers_payload_cache
+    if cached is None or cached[0] != generation:
+        cached = (generation, _build_providers_payload())
+        _providers_payload_cache = cached
+    return cached[1]
+
+
+@router.get("/providers")
+async def list_providers() -> Response:
+    return Response(content=_providers_payload(), media_type="application/json")
 
 
 @router.get("/providers/{provider_id}/models")
-async def list_provider_models(provider_id: str) -> JSONResponse:
+async def list_provider_models(provider_id: str) -> ORJSONResponse:
     provider = provider_registry.get_provider(provider_id)
     if provider is None:
         raise HTTPException(status_code=404, detail="provider not found")
@@ -59,11 +82,11 @@ async def list_provider_models(provider_id: str) -> JSONResponse:
         models = provider_registry.list_models(provider_id)
     except Exception as exc:  # pragma: no cover - depends on external API availability
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return JSONResponse({"models": models})
+    return ORJSONResponse({"models": models})
 
 
 @router.post("/sessions")
-async def create_session(payload: Dict[str, Any]) -> JSONResponse:
+async def create_session(payload: Dict[str, Any]) -> ORJSONResponse:
     required = payload.get("debugger")
     provider = payload.get("provider")
     if not required or not provider:
@@ -91,21 +114,21 @@ async def create_session(payload: Dict[str, Any]) -> JSONResponse:
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return JSONResponse({"session_id": session.session_id, "initial_messages": initial_messages})
+    return ORJSONResponse({"session_id": session.session_id, "initial_messages": initial_messages})
 
 
 @router.delete("/sessions/{session_id}")
-async def close_session(session_id: str) -> JSONResponse:
+async def close_session(session_id: str) -> ORJSONResponse:
     try:
         session_manager.get_session(session_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="session not found")
     await session_manager.close_session(session_id)
-    return JSONResponse({"status": "closed"})
+    return ORJSONResponse({"status": "closed"})
 
 
 @router.post("/sessions/{session_id}/command")
-async def run_command(session_id: str, payload: Dict[str, Any]) -> JSONResponse:
+async def run_command(session_id: str, payload: Dict[str, Any], background: BackgroundTasks) -> ORJSONResponse:
     command = payload.get("command")
     if command is None:
         raise HTTPException(status_code=400, detail="command is required")
@@ -114,12 +137,13 @@ async def run_command(session_id: str, payload: Dict[str, Any]) -> JSONResponse:
     except KeyError:
         raise HTTPException(status_code=404, detail="session not found")
 
-    await session_manager.run_debugger_command(session, command)
-    return JSONResponse({"status": "queued"})
+    job_id = session_manager.create_job(session, "command")
+    background.add_task(session_manager.run_job, job_id, session, session_manager.run_debugger_command, command)
+    return ORJSONResponse({"status": "queued", "job_id": job_id})
 
 
 @router.post("/sessions/{session_id}/chat")
-async def run_chat(session_id: str, payload: Dict[str, Any]) -> JSONResponse:
+async def run_chat(session_id: str, payload: Dict[str, Any], background: BackgroundTasks) -> ORJSONResponse:
     message = payload.get("message")
     if not message:
         raise HTTPException(status_code=400, detail="message is required")
@@ -128,37 +152,50 @@ async def run_chat(session_id: str, payload: Dict[str, Any]) -> JSONResponse:
     except KeyError:
         raise HTTPException(status_code=404, detail="session not found")
 
-    answer = await session_manager.run_chat(session, message)
-    return JSONResponse({"status": "completed", "answer": answer})
+    # The answer is streamed over /ws/chat; poll /api/jobs/{job_id} for status.
+    job_id = session_manager.create_job(session, "chat")
+    background.add_task(session_manager.run_job, job_id, session, session_manager.run_chat, message)
+    return ORJSONResponse({"status": "queued", "job_id": job_id})
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> ORJSONResponse:
+    try:
+        job = session_manager.get_job(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="job not found")
+    return ORJSONResponse(job)
 
 
 @router.post("/sessions/{session_id}/auto-approve")
-async def set_auto_approve(session_id: str, payload: Dict[str, Any]) -> JSONResponse:
+async def set_auto_approve(session_id: str, payload: Dict[str, Any]) -> ORJSONResponse:
     try:
         session = session_manager.get_session(session_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="session not found")
     enabled = bool(payload.get("enabled"))
     await session_manager.set_auto_approve(session, enabled)
-    return JSONResponse({"status": "ok", "enabled": enabled})
+    return ORJSONResponse({"status": "ok", "enabled": enabled})
 
 
 @router.get("/workspace")
-async def browse_workspace(path: Optional[str] = None) -> JSONResponse:
-    base = Path.cwd().resolve()
-    target = (base / (path or ".")).resolve()
-    if not str(target).startswith(str(base)):
+async def browse_workspace(path: Optional[str] = None) -> ORJSONResponse:
+    target = (_WORKSPACE_BASE / (path or ".")).resolve()
+    if not target.is_relative_to(_WORKSPACE_BASE):
         raise HTTPException(status_code=400, detail="Path escapes workspace root")
-    if not target.exists() or not target.is_dir():
+    if not target.is_dir():
         raise HTTPException(status_code=404, detail="Directory not found")
 
-    entries: List[Dict[str, Any]] = []
-    for child in sorted(target.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())):
-        entries.append(
-            {
-                "name": child.name,
-                "is_dir": child.is_dir(),
-                "path": str(child.relative_to(base)),
-            }
-        )
-    return JSONResponse({"path": str(target.relative_to(base)), "entries": entries})
+    rel_target = target.relative_to(_WORKSPACE_BASE)
+    with os.scandir(target) as it:
+        # DirEntry.is_dir() reuses the d_type from readdir, avoiding a stat per child.
+        children = sorted(((not entry.is_dir(), entry.name.lower(), entry.name) for entry in it))
+    entries: List[Dict[str, Any]] = [
+        {
+            "name": name,
+            "is_dir": not is_file,
+            "path": str(rel_target / name),
+        }
+        for is_file, _, name in children
+    ]
+    return ORJSONResponse({"path": str(rel_target), "entries": entries})
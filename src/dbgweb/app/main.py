@@ -1,16 +1,28 @@
 """FastAPI entry point for the dbgweb browser UI."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
+from dbgcopilot.llm import http_pool
+
 from .api.routes import router as api_router
 from .ws.routes import ws_router
 
 
-app = FastAPI(title="Debugger Copilot", version="0.1.0")
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Release the LLM providers' pooled keep-alive connections.
+    http_pool.close_session()
+
+
+app = FastAPI(title="Debugger Copilot", version="0.1.0", lifespan=_lifespan)
 
 
 def _static_dir() -> Path:
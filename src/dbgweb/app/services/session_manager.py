@@ -5,42 +5,233 @@ import asyncio
 import uuid
 import json
 import logging
+import os
+import queue
 import re
+import threading
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
 
 from dbgcopilot.core.orchestrator import CopilotOrchestrator
 from dbgcopilot.core.state import SessionState, Attempt, resolve_auto_round_limit
 from dbgcopilot.utils.io import strip_ansi
-from dbgcopilot.backends.gdb_subprocess import GdbSubprocessBackend
-from dbgcopilot.backends.lldb_inprocess import LldbInProcessBackend
-from dbgcopilot.backends.lldb_subprocess import LldbSubprocessBackend
-from dbgcopilot.backends.lldb_api import LldbApiBackend
-from dbgcopilot.backends.rust_gdb import RustGdbBackend
-from dbgcopilot.backends.java_jdb import JavaJdbBackend
 
+from .spsc_queue import SpscQueue
 
-logger = logging.getLogger(__name__)
 
+logger = logging.getLogger(__name__)
 
-def _queue_factory() -> asyncio.Queue[str]:
-    return asyncio.Queue()
+# Bracketed-paste mode toggles emitted by readline-based debuggers.
+_BRACKETED_PASTE_RE = re.compile(r"\x1b\[\?2004[lh]")
+# Line boundaries str.splitlines() honours besides "\n".
+_OTHER_LINE_BREAK_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# Backends whose output is rewritten line by line after the first-line check.
+_LINE_REWRITE_BACKENDS = frozenset({"delve", "radare2"})
+_ANSI_PREFIX = r"(?:\x1b\[[0-9;]*m)*"
+_DELVE_PROMPT_TOKEN = re.compile(rf"^{_ANSI_PREFIX}(?:delve>|dlv>)\s*", re.IGNORECASE)
+_RADARE2_PROMPT_TOKEN = re.compile(rf"^{_ANSI_PREFIX}(?:radare2>|\(radare2\))\s*", re.IGNORECASE)
+
+# Initial target loading, keyed by lower-cased backend name.
+_LLDB_BACKENDS = frozenset({"lldb", "rust-lldb", "lldb-rust"})
+_PROGRAM_LOAD_COMMANDS = {
+    "gdb": "file {}",
+    "rust-gdb": "file {}",
+    **dict.fromkeys(_LLDB_BACKENDS, "file {}"),
+    "python": "file {}",
+    "pdb": "file {}",
+}
+_COREFILE_LOAD_COMMANDS = {
+    "gdb": "core-file {}",
+    "rust-gdb": "core-file {}",
+    **dict.fromkeys(_LLDB_BACKENDS, "target create -c {}"),
+}
+_STARTUP_OUTPUT_BACKENDS = frozenset({"delve", "radare2"})
+
+
+@lru_cache(maxsize=64)
+def _leading_prompt_pattern(backend_name: str, backend_prompt: str) -> re.Pattern[str]:
+    """Compile the echoed-prompt matcher for a backend once.
+
+    The variants are joined into one anchored alternation in priority order,
+    so the first variant that matches wins, as with trying them one by one.
+    """
+    prompt_variants: list[str] = []
+    if backend_prompt:
+        prompt_variants.append(strip_ansi(backend_prompt).strip().lower())
+    prompt_variants.extend(["(gdb)", "gdb>", "(lldb)", "lldb>"])
+    if backend_name in {"rust-lldb", "lldb-rust"}:
+        prompt_variants.extend(["(rust-lldb)", "rust-lldb>", "(lldb-rust)", "lldb-rust>"])
+    if backend_name in {"pdb", "python"}:
+        prompt_variants.extend(["(pydb)", "pdb>"])
+    if backend_name == "jdb":
+        prompt_variants.extend([">", "jdb>"])
+    if backend_name == "radare2":
+        prompt_variants.extend(["radare2>", "(radare2)"])
+    alternation = "|".join(re.escape(prefix) for prefix in prompt_variants if prefix)
+    return re.compile(rf"^{_ANSI_PREFIX}(?:{alternation})\s*", re.IGNORECASE)
+
+
+# Messages buffered per output stream while its websocket reader is behind.
+_STREAM_QUEUE_MAXSIZE = 1024
+# Upper bound (in characters) for one coalesced debugger websocket frame.
+_OUTPUT_BATCH_LIMIT = 64 * 1024
+
+# Finished background jobs kept for /api/jobs lookups; oldest are dropped first.
+_JOB_HISTORY = 256
+
+
+# Bound encoder method: skips json.dumps()'s per-call keyword-argument checks.
+_encode_json = json.JSONEncoder().encode
+
+
+def _encode_chat_events(events: Iterable[Dict[str, Any]]) -> list[str]:
+    """Serialize chat events, one websocket frame each; unserializable events are skipped."""
+    payloads: list[str] = []
+    for event in events:
+        try:
+            payloads.append(_encode_json(event))
+        except TypeError:
+            continue
+    return payloads
+
+
+def _queue_factory() -> SpscQueue[str]:
+    return SpscQueue(maxsize=_STREAM_QUEUE_MAXSIZE)
+
+
+def _resolve_future(fut: asyncio.Future[Any], result: Any, exc: Optional[BaseException]) -> None:
+    if fut.cancelled():
+        return
+    if exc is not None:
+        fut.set_exception(exc)
+    else:
+        fut.set_result(result)
+
+
+class _BackendExecutor:
+    """Bounded pool of daemon threads shared by every session's blocking calls.
+
+    Sessions submit through their own ``_SessionWorker`` lane. A lane is handed
+    to at most one thread at a time, so each backend still sees its commands in
+    FIFO order, while different sessions run in parallel. After each job a lane
+    with more work goes to the back of the ready queue (round robin), so one
+    busy session cannot hold a thread while others wait.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers = max_workers
+        self._ready: queue.SimpleQueue[_SessionWorker] = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._threads = 0
+
+    def schedule(self, lane: "_SessionWorker") -> None:
+        self._ready.put(lane)
+        if self._idle.acquire(timeout=0):
+            return  # an idle thread will pick it up
+        with self._lock:
+            if self._threads >= self._max_workers:
+                return
+            self._threads += 1
+            name = f"dbgweb-backend-{self._threads}"
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            self._ready.get().run_one()
+            self._idle.release()
+
+
+# Threads are started on demand. Backend commands can block for a long time
+# (a `continue` that never stops), so keep a floor well above the core count.
+_backend_executor = _BackendExecutor(max(16, min(64, 4 * (os.cpu_count() or 1))))
+
+
+class _SessionWorker:
+    """One session's FIFO lane onto the shared ``_BackendExecutor``.
+
+    A debugger backend owns a single stdin/stdout pair, so its calls must run
+    one at a time and in order; the lane guarantees that without a dedicated
+    thread per session.
+    """
+
+    def __init__(self, executor: _BackendExecutor) -> None:
+        self._executor = executor
+        self._jobs: deque[tuple[Any, ...]] = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._stopped = False
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> asyncio.Future[Any]:
+        """Queue ``fn(*args)`` and return a future resolved on the caller's loop."""
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[Any] = loop.create_future()
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("session is closed")
+            self._jobs.append((loop, fut, fn, args))
+            if self._scheduled:
+                return fut
+            self._scheduled = True
+        self._executor.schedule(self)
+        return fut
+
+    def stop(self) -> None:
+        """Refuse new calls; jobs already queued still run."""
+        with self._lock:
+            self._stopped = True
+
+    def run_one(self) -> None:
+        with self._lock:
+            loop, fut, fn, args = self._jobs.popleft()
+        try:
+            result, exc = fn(*args), None
+        except BaseException as err:  # delivered to the awaiting coroutine
+            result, exc = None, err
+        try:
+            loop.call_soon_threadsafe(_resolve_future, fut, result, exc)
+        except RuntimeError:
+            # Event loop already closed (server shutdown); nobody is waiting.
+            pass
+        with self._lock:
+            if not self._jobs:
+                self._scheduled = False
+                return
+        self._executor.schedule(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     session_id: str
     orchestrator: CopilotOrchestrator
     state: SessionState
     debugger_backend: Any
-    debugger_queue: asyncio.Queue[str] = field(default_factory=_queue_factory)
-    chat_queue: asyncio.Queue[str] = field(default_factory=_queue_factory)
+    debugger_queue: SpscQueue[str] = field(default_factory=_queue_factory)
+    chat_queue: SpscQueue[str] = field(default_factory=_queue_factory)
+    # Serializes background work so queued commands/chats never drive the
+    # debugger concurrently.
+    work_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    worker: _SessionWorker = field(init=False)
+    # Rendered backend prompt and the raw prompt it was rendered from; most
+    # backends never change it, radare2 embeds the current address.
+    prompt_text: str = field(default="", init=False)
+    prompt_source: Optional[str] = field(default=None, init=False)
+    # Lower-cased ``debugger_backend.name``; the backend never changes for a session.
+    backend_name: str = field(default="", init=False)
+
+    def __post_init__(self) -> None:
+        self.worker = _SessionWorker(_backend_executor)
+        self.backend_name = getattr(self.debugger_backend, "name", "").lower()
 
 
 class SessionManager:
     def __init__(self) -> None:
         self.sessions: Dict[str, Session] = {}
-        self._lock = asyncio.Lock()
+        # Guards only the sessions dict; never held across an await.
+        self._lock = threading.Lock()
+        self.jobs: OrderedDict[str, Dict[str, Any]] = OrderedDict()
 
     async def create_session(
         self,
@@ -55,100 +246,100 @@ class SessionManager:
         sourcepath: Optional[str] = None,
         auto_approve: bool = False,
     ) -> tuple[Session, list[str]]:
-        async with self._lock:
-            session_id = uuid.uuid4().hex[:8]
-            backend = self._create_backend(
-                debugger,
-                program=program,
-                corefile=corefile,
-                classpath=classpath,
-                sourcepath=sourcepath,
-            )
-            state = SessionState(session_id=session_id)
-            state.provider_name = provider
-            state.model_override = model
-            state.provider_api_key = api_key
-            state.selected_provider = provider
-            state.config["llm_provider"] = provider
-            if api_key:
-                state.config[f"{provider.replace('-', '_')}_api_key"] = api_key
-            if model:
-                state.config[f"{provider.replace('-', '_')}_model"] = model
-            if auto_approve:
-                state.auto_accept_commands = True
-                state.config["auto_accept_commands"] = "true"
-                state.auto_rounds_remaining = resolve_auto_round_limit(state.config)
-            backend_name = getattr(backend, "name", "")
-            if debugger == "jdb":
-                if classpath:
-                    state.config["classpath"] = classpath
-                if sourcepath:
-                    state.config["sourcepath"] = sourcepath
-                if program:
-                    state.config["jdb_main_class"] = program
-            elif program and backend_name in {"delve", "radare2", "pdb"}:
-                state.config["program"] = program
-            orchestrator = CopilotOrchestrator(backend, state)
-            session = Session(
-                session_id=session_id,
-                orchestrator=orchestrator,
-                state=state,
-                debugger_backend=backend,
-            )
-            loop = asyncio.get_running_loop()
-
-            def emit_debugger_output(text: str) -> None:
-                if not text:
-                    return
-                formatted = self._format_debugger_output(session, text)
-                if not formatted:
-                    return
-                asyncio.run_coroutine_threadsafe(session.debugger_queue.put(formatted), loop)
-
-            state.debugger_output_sink = emit_debugger_output
-
-            def emit_chat(text: str) -> None:
-                if not text:
-                    return
-                asyncio.run_coroutine_threadsafe(
-                    session.chat_queue.put(strip_ansi(text)),
-                    loop,
-                )
-
-            state.chat_output_sink = emit_chat
-
-            def emit_chat_event(event: Dict[str, Any]) -> None:
-                if not event:
-                    return
-                try:
-                    payload = json.dumps(event)
-                except TypeError:
-                    return
-                asyncio.run_coroutine_threadsafe(session.chat_queue.put(payload), loop)
-
-            state.chat_event_sink = emit_chat_event
+        session_id = uuid.uuid4().hex[:8]
+        # Backend start-up blocks (process spawn, first prompt); run it off the
+        # loop and without any manager-wide lock so sessions start in parallel.
+        backend = await asyncio.to_thread(
+            self._create_backend,
+            debugger,
+            program=program,
+            corefile=corefile,
+            classpath=classpath,
+            sourcepath=sourcepath,
+        )
+        state = SessionState(session_id=session_id)
+        state.provider_name = provider
+        state.model_override = model
+        state.provider_api_key = api_key
+        state.selected_provider = provider
+        state.config["llm_provider"] = provider
+        if api_key:
+            state.config[f"{provider.replace('-', '_')}_api_key"] = api_key
+        if model:
+            state.config[f"{provider.replace('-', '_')}_model"] = model
+        if auto_approve:
+            state.auto_accept_commands = True
+            state.config["auto_accept_commands"] = "true"
+            state.auto_rounds_remaining = resolve_auto_round_limit(state.config)
+        backend_name = getattr(backend, "name", "")
+        if debugger == "jdb":
+            if classpath:
+                state.config["classpath"] = classpath
+            if sourcepath:
+                state.config["sourcepath"] = sourcepath
+            if program:
+                state.config["jdb_main_class"] = program
+        elif program and backend_name in {"delve", "radare2", "pdb"}:
+            state.config["program"] = program
+        orchestrator = CopilotOrchestrator(backend, state)
+        session = Session(
+            session_id=session_id,
+            orchestrator=orchestrator,
+            state=state,
+            debugger_backend=backend,
+        )
+        loop = asyncio.get_running_loop()
+
+        def emit_debugger_output(text: str) -> None:
+            if not text:
+                return
+            formatted = self._format_debugger_output(session, text)
+            if not formatted:
+                return
+            loop.call_soon_threadsafe(session.debugger_queue.put_nowait, formatted)
+
+        state.debugger_output_sink = emit_debugger_output
+
+        def emit_chat(text: str) -> None:
+            if not text:
+                return
+            loop.call_soon_threadsafe(session.chat_queue.put_nowait, strip_ansi(text))
+
+        state.chat_output_sink = emit_chat
+
+        def emit_chat_event(event: Dict[str, Any]) -> None:
+            if not event:
+                return
+            try:
+                payload = _encode_json(event)
+            except TypeError:
+                return
+            loop.call_soon_threadsafe(session.chat_queue.put_nowait, payload)
+
+        state.chat_event_sink = emit_chat_event
+        with self._lock:
             self.sessions[session_id] = session
-            initial_messages: list[str] = []
-            if program and backend_name not in {"jdb"}:
-                init_output = await asyncio.to_thread(self._load_program_for_backend, session, program)
-                if init_output:
-                    formatted = self._format_debugger_output(session, init_output)
-                    if formatted:
-                        initial_messages.append(formatted)
-                        await session.debugger_queue.put(formatted)
-            if corefile:
-                init_output = await asyncio.to_thread(self._load_corefile_for_backend, session, corefile)
-                if init_output:
-                    formatted = self._format_debugger_output(session, init_output)
-                    if formatted:
-                        initial_messages.append(formatted)
-                        await session.debugger_queue.put(formatted)
-            if not program and not corefile:
-                prompt = self._prompt_text(session)
-                if prompt:
-                    initial_messages.append(prompt)
-                    await session.debugger_queue.put(prompt)
-            return session, initial_messages
+        initial_messages: list[str] = []
+        if (program and backend_name not in {"jdb"}) or corefile:
+            init_outputs = await session.worker.call(
+                self._load_initial_targets,
+                session,
+                program if backend_name not in {"jdb"} else None,
+                corefile,
+            )
+            for init_output in init_outputs:
+                if not init_output:
+                    continue
+                formatted = self._format_debugger_output(session, init_output)
+                if formatted:
+                    initial_messages.append(formatted)
+                    session.debugger_queue.put_nowait(formatted)
+        if not program and not corefile:
+            prompt = self._prompt_text(session)
+            if prompt:
+                initial_messages.append(prompt)
+                session.debugger_queue.put_nowait(prompt)
+        return session, initial_messages
 
     def get_session(self, session_id: str) -> Session:
         session = self.sessions.get(session_id)
@@ -157,13 +348,16 @@ class SessionManager:
         return session
 
     async def close_session(self, session_id: str) -> None:
-        async with self._lock:
+        with self._lock:
             session = self.sessions.pop(session_id, None)
-            if session and hasattr(session.debugger_backend, "close"):
-                try:
-                    session.debugger_backend.close()
-                except Exception:
-                    pass
+        if session is None:
+            return
+        if hasattr(session.debugger_backend, "close"):
+            try:
+                session.debugger_backend.close()
+            except Exception:
+                pass
+        session.worker.stop()
 
     async def set_auto_approve(self, session: Session, enabled: bool) -> None:
         state = session.state
@@ -178,61 +372,114 @@ class SessionManager:
             state.config.pop("auto_accept_commands", None)
             state.auto_rounds_remaining = None
         try:
-            payload = json.dumps(event)
+            payload = _encode_json(event)
         except TypeError:
             payload = ""
         if payload:
-            await session.chat_queue.put(payload)
+            session.chat_queue.put_nowait(payload)
+
+    def create_job(self, session: Session, kind: str) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        self.jobs[job_id] = {"job_id": job_id, "session_id": session.session_id, "kind": kind, "status": "queued"}
+        while len(self.jobs) > _JOB_HISTORY:
+            self.jobs.popitem(last=False)
+        return job_id
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        return job
+
+    async def run_job(
+        self,
+        job_id: str,
+        session: Session,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> None:
+        """Run ``func(session, *args)`` for a queued request and record the outcome.
+
+        Results already reach clients through the session's websocket queues;
+        the job record only tracks status (and the return value) for polling.
+        """
+        job = self.jobs.get(job_id, {})
+        async with session.work_lock:
+            job["status"] = "running"
+            try:
+                result = await func(session, *args)
+            except Exception as exc:
+                logger.exception("dbgweb job %s failed", job_id)
+                job["status"] = "failed"
+                job["error"] = str(exc)
+                session.chat_queue.put_nowait(f"[error] {exc}")
+                return
+        job["status"] = "completed"
+        if result is not None:
+            job["result"] = result
 
     async def run_debugger_command(self, session: Session, command: str) -> None:
-        result = await asyncio.to_thread(session.debugger_backend.run_command, command)
+        result = await session.worker.call(session.debugger_backend.run_command, command)
+        # Calling the backend directly never reaches ``debugger_output_sink`` (only the
+        # orchestrator's command execution does), so this is the one place the output is queued.
         formatted = self._format_debugger_output(session, result)
         if formatted:
-            await session.debugger_queue.put(formatted)
+            session.debugger_queue.put_nowait(formatted)
         session.state.last_output = result or ""
-        session.state.attempts.append(
-            Attempt(cmd=command, output_snippet=(result or "")[:160])
-        )
+        session.state.attempts.append(Attempt.from_output(command, result))
 
     async def run_chat(self, session: Session, message: str) -> str:
-        def _ask() -> str:
-            return session.orchestrator.ask(message)
-
-        answer = await asyncio.to_thread(_ask)
+        answer = await session.worker.call(session.orchestrator.ask, message)
         clean_answer = strip_ansi(answer)
         if (
             clean_answer
             and not session.state.last_answer_streamed
             and not session.state.pending_chat_events
         ):
-            await session.chat_queue.put(clean_answer)
+            session.chat_queue.put_nowait(clean_answer)
         pending_chat = list(session.state.pending_chat)
         session.state.pending_chat.clear()
         for chunk in pending_chat:
             cleaned = strip_ansi(chunk)
             if cleaned:
-                await session.chat_queue.put(cleaned)
-        pending_events = list(session.state.pending_chat_events)
-        session.state.pending_chat_events.clear()
-        for event in pending_events:
-            try:
-                payload = json.dumps(event)
-            except TypeError:
-                continue
-            await session.chat_queue.put(payload)
+                session.chat_queue.put_nowait(cleaned)
+        pending_events = session.state.pending_chat_events
+        if pending_events:
+            payloads = _encode_chat_events(pending_events)
+            pending_events.clear()
+            for payload in payloads:
+                session.chat_queue.put_nowait(payload)
         pending = list(session.state.pending_outputs)
         session.state.pending_outputs.clear()
         if pending:
-            for chunk in pending:
-                formatted = self._format_debugger_output(session, chunk)
-                if formatted:
-                    await session.debugger_queue.put(formatted)
+            self._put_debugger_batched(
+                session, (self._format_debugger_output(session, chunk) for chunk in pending)
+            )
         elif session.state.last_output and not getattr(session.state, "debugger_output_sink", None):
             formatted = self._format_debugger_output(session, session.state.last_output)
             if formatted:
-                await session.debugger_queue.put(formatted)
+                session.debugger_queue.put_nowait(formatted)
         return clean_answer
 
+    def _put_debugger_batched(self, session: Session, outputs: Iterable[str]) -> None:
+        """Enqueue formatted outputs as few websocket frames of up to ``_OUTPUT_BATCH_LIMIT`` chars.
+
+        The terminal view appends frames verbatim, so concatenating them renders
+        the same as sending one frame per chunk.
+        """
+        batch: list[str] = []
+        size = 0
+        for formatted in outputs:
+            if not formatted:
+                continue
+            if batch and size + len(formatted) > _OUTPUT_BATCH_LIMIT:
+                session.debugger_queue.put_nowait("".join(batch))
+                batch, size = [], 0
+            batch.append(formatted)
+            size += len(formatted)
+        if batch:
+            session.debugger_queue.put_nowait("".join(batch))
+
     def _create_backend(
         self,
         debugger: str,
@@ -243,10 +490,14 @@ class SessionManager:
         sourcepath: Optional[str] = None,
     ):
         if debugger == "rust-gdb":
+            from dbgcopilot.backends.rust_gdb import RustGdbBackend
+
             backend = RustGdbBackend()
             backend.initialize_session()
             return backend
         if debugger == "gdb":
+            from dbgcopilot.backends.gdb_subprocess import GdbSubprocessBackend
+
             backend = GdbSubprocessBackend()
             backend.initialize_session()
             return backend
@@ -271,6 +522,8 @@ class SessionManager:
             backend.initialize_session()
             return backend
         if debugger == "jdb":
+            from dbgcopilot.backends.java_jdb import JavaJdbBackend
+
             backend = JavaJdbBackend(
                 program=program,
                 classpath=classpath,
@@ -289,6 +542,8 @@ class SessionManager:
     def _create_lldb_backend(self):
         api_error: Optional[Exception] = None
         try:
+            from dbgcopilot.backends.lldb_api import LldbApiBackend
+
             backend = LldbApiBackend()
             backend.initialize_session()
             return backend
@@ -299,12 +554,16 @@ class SessionManager:
             import lldb  # type: ignore
 
             if getattr(lldb, "debugger", None):
+                from dbgcopilot.backends.lldb_inprocess import LldbInProcessBackend
+
                 backend = LldbInProcessBackend()
                 backend.initialize_session()
                 return backend
         except Exception:
             pass
 
+        from dbgcopilot.backends.lldb_subprocess import LldbSubprocessBackend
+
         backend = LldbSubprocessBackend()
         backend.initialize_session()
         if api_error:
@@ -333,82 +592,76 @@ class SessionManager:
             )
         return backend
 
+    def _load_initial_targets(
+        self, session: Session, program: Optional[str], corefile: Optional[str]
+    ) -> list[Optional[str]]:
+        """Load the program and/or core file in one worker job; returns the outputs in order."""
+        if program and corefile and session.backend_name in _LLDB_BACKENDS:
+            # target create takes both at once, saving the separate `file` round-trip.
+            return [session.debugger_backend.run_command(f"target create --core {corefile} {program}")]
+        outputs: list[Optional[str]] = []
+        if program:
+            outputs.append(self._load_program_for_backend(session, program))
+        if corefile:
+            outputs.append(self._load_corefile_for_backend(session, corefile))
+        return outputs
+
     def _load_program_for_backend(self, session: Session, program: str) -> Optional[str]:
         backend = session.debugger_backend
-        name = getattr(backend, "name", "").lower()
-        if name in {"gdb", "rust-gdb"}:
-            return backend.run_command(f"file {program}")
-        if name in {"lldb", "rust-lldb", "lldb-rust"}:
-            return backend.run_command(f"file {program}")
-        if name == "delve":
-            return getattr(backend, "startup_output", "")
-        if name == "radare2":
+        name = session.backend_name
+        command = _PROGRAM_LOAD_COMMANDS.get(name)
+        if command is not None:
+            return backend.run_command(command.format(program))
+        if name in _STARTUP_OUTPUT_BACKENDS:
+            # These backends were started with the program already loaded.
             return getattr(backend, "startup_output", "")
-        if name in {"python", "pdb"}:
-            return backend.run_command(f"file {program}")
         return None
 
     def _load_corefile_for_backend(self, session: Session, corefile: str) -> Optional[str]:
-        backend = session.debugger_backend
-        name = getattr(backend, "name", "").lower()
-        if name in {"gdb", "rust-gdb"}:
-            return backend.run_command(f"core-file {corefile}")
-        if name in {"lldb", "rust-lldb", "lldb-rust"}:
-            return backend.run_command(f"target create -c {corefile}")
-        return None
+        command = _COREFILE_LOAD_COMMANDS.get(session.backend_name)
+        if command is None:
+            return None
+        return session.debugger_backend.run_command(command.format(corefile))
 
     def _prompt_text(self, session: Session) -> str:
-        prompt = getattr(session.debugger_backend, "prompt", "") or ""
-        prompt = prompt.replace("\r", "").replace("\n", "")
+        source = getattr(session.debugger_backend, "prompt", "") or ""
+        if source is session.prompt_source:
+            return session.prompt_text
+        prompt = source.replace("\r", "").replace("\n", "")
         if prompt and not prompt.endswith(" "):
             prompt = f"{prompt} "
+        session.prompt_source = source
+        session.prompt_text = prompt
         return prompt
 
     def _format_debugger_output(self, session: Session, text: Optional[str]) -> str:
         raw = (text or "").rstrip("\r")
         if raw:
-            raw = (
-                raw.replace("\x1b[?2004l", "")
-                .replace("\x1b[?2004h", "")
-                .replace("\u001b[?2004l", "")
-                .replace("\u001b[?2004h", "")
-            )
-        backend_name = getattr(session.debugger_backend, "name", "").lower()
+            raw = _BRACKETED_PASTE_RE.sub("", raw)
+        backend_name = session.backend_name
         if raw:
+            backend_prompt = getattr(session.debugger_backend, "prompt", "") or ""
+            prompt_pattern = _leading_prompt_pattern(backend_name, backend_prompt)
+            if backend_name not in _LINE_REWRITE_BACKENDS and not _OTHER_LINE_BREAK_RE.search(raw):
+                # Plain "\n"-separated output: only the first line can change, so
+                # skip the splitlines()/join round trip. Same result as below,
+                # including dropping one trailing newline.
+                if raw.endswith("\n"):
+                    raw = raw[:-1]
+                nl = raw.find("\n")
+                first = raw if nl == -1 else raw[:nl]
+                match = prompt_pattern.match(first)
+                if match and not first[match.end():].lstrip():
+                    raw = "" if nl == -1 else raw[nl + 1 :]
+                return self._append_prompt(session, raw)
             lines = raw.splitlines()
             if lines:
                 first = lines[0]
-                prompt_variants: list[str] = []
-                backend_prompt = getattr(session.debugger_backend, "prompt", "") or ""
-                if backend_prompt:
-                    prompt_variants.append(strip_ansi(backend_prompt).strip().lower())
-                prompt_variants.extend(["(gdb)", "gdb>", "(lldb)", "lldb>"])
-                if backend_name in {"rust-lldb", "lldb-rust"}:
-                    prompt_variants.extend(["(rust-lldb)", "rust-lldb>", "(lldb-rust)", "lldb-rust>"])
-                if backend_name in {"pdb", "python"}:
-                    prompt_variants.extend(["(pydb)", "pdb>"])
-                if backend_name == "jdb":
-                    prompt_variants.extend([">", "jdb>"])
-                if backend_name == "radare2":
-                    prompt_variants.extend(["radare2>", "(radare2)"])
-                ansi_prefix = r"(?:\x1b\[[0-9;]*m)*"
-                prompt_patterns: list[re.Pattern[str]] = []
-                for prefix in prompt_variants:
-                    if not prefix:
-                        continue
-                    prompt_patterns.append(
-                        re.compile(rf"^{ansi_prefix}{re.escape(prefix)}\s*", re.IGNORECASE)
-                    )
-                for pattern in prompt_patterns:
-                    match = pattern.match(first)
-                    if not match:
-                        continue
-                    remainder = first[match.end():].lstrip()
-                    if not remainder:
-                        lines = lines[1:]
-                    break
+                match = prompt_pattern.match(first)
+                if match and not first[match.end():].lstrip():
+                    lines = lines[1:]
             if backend_name == "delve" and lines:
-                prompt_token = re.compile(r"^(?:\x1b\[[0-9;]*m)*(?:delve>|dlv>)\s*", re.IGNORECASE)
+                prompt_token = _DELVE_PROMPT_TOKEN
                 cleaned: list[str] = []
                 for line in lines:
                     if not line:
@@ -424,7 +677,7 @@ class SessionManager:
                     cleaned.append(cleaned_line)
                 lines = cleaned
             if backend_name == "radare2" and lines:
-                prompt_token = re.compile(r"^(?:\x1b\[[0-9;]*m)*(?:radare2>|\(radare2\))\s*", re.IGNORECASE)
+                prompt_token = _RADARE2_PROMPT_TOKEN
                 cleaned: list[str] = []
                 for line in lines:
                     match = prompt_token.match(line or "")
@@ -439,15 +692,16 @@ class SessionManager:
                         continue
                 lines = cleaned
             raw = "\n".join(lines)
+        return self._append_prompt(session, raw)
+
+    def _append_prompt(self, session: Session, raw: str) -> str:
         prompt = self._prompt_text(session)
-        if prompt:
-            if raw:
-                if not raw.endswith("\n"):
-                    raw += "\n"
-                raw += prompt
-            else:
-                raw = prompt
-        return raw
+        if not prompt:
+            return raw
+        if not raw:
+            return prompt
+        # One join: a single copy of ``raw`` instead of one per ``+=``.
+        return "".join((raw, "" if raw.endswith("\n") else "\n", prompt))
 
 
 session_manager = SessionManager()
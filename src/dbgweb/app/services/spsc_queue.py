@@ -0,0 +1,69 @@
+"""Lightweight single-producer/single-consumer queue for session output streams."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Deque, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SpscQueue(Generic[T]):
+    """Queue for one event loop with one writer (session sinks) and one reader (websocket).
+
+    Unlike ``asyncio.Queue`` there is no per-get future or getter bookkeeping:
+    items sit in a deque and a single ``asyncio.Event`` wakes the reader when
+    the queue goes from empty to non-empty. All methods must be called from
+    the loop's thread; producers on other threads go through
+    ``loop.call_soon_threadsafe``.
+
+    With ``maxsize`` set the queue acts as a ring: a put on a full queue drops
+    the oldest item and counts it, so a stalled reader cannot grow memory
+    without bound. The reader collects that count with ``take_dropped()``.
+    """
+
+    __slots__ = ("_items", "_ready", "_dropped")
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._items: Deque[T] = deque(maxlen=maxsize or None)
+        self._ready = asyncio.Event()
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put_nowait(self, item: T) -> None:
+        items = self._items
+        if items.maxlen is not None and len(items) == items.maxlen:
+            self._dropped += 1  # append() below evicts the oldest item
+        items.append(item)
+        self._ready.set()
+
+    def take_dropped(self) -> int:
+        """Return how many items were evicted since the last call, and reset the count."""
+        dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    async def put(self, item: T) -> None:
+        self.put_nowait(item)
+
+    def pop(self) -> T:
+        """Remove and return the oldest item; raises ``IndexError`` when empty."""
+        item = self._items.popleft()
+        if not self._items:
+            self._ready.clear()
+        return item
+
+    async def wait_nonempty(self) -> None:
+        while not self._items:
+            await self._ready.wait()
+
+    async def get(self) -> T:
+        await self.wait_nonempty()
+        return self.pop()
+
+
+__all__ = ["SpscQueue"]
@@ -1,21 +1,36 @@
 """WebSocket endpoints for debugger and chat streaming."""
 from __future__ import annotations
 
-import asyncio
-from typing import AsyncIterator
+import json
+from typing import Callable
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from ..services.session_manager import session_manager
+from ..services.spsc_queue import SpscQueue
 
 ws_router = APIRouter()
 
 
-async def _consume_queue(queue: asyncio.Queue[str]) -> AsyncIterator[str]:
+def _debugger_drop_notice(dropped: int) -> str:
+    return f"[dbgweb] {dropped} earlier message(s) dropped while the client was not keeping up\n"
+
+
+def _chat_drop_notice(dropped: int) -> str:
+    # The chat UI renders JSON frames by type; a raw line would show up as a stray bubble.
+    return json.dumps({"type": "messages_dropped", "count": dropped})
+
+
+async def _pump_queue(websocket: WebSocket, queue: SpscQueue[str], drop_notice: Callable[[int], str]) -> None:
+    """Forward queued messages to ``websocket`` until the client disconnects."""
+    send_text = websocket.send_text
     while True:
-        item = await queue.get()
-        yield item
-        queue.task_done()
+        await queue.wait_nonempty()
+        while queue:
+            dropped = queue.take_dropped()
+            if dropped:
+                await send_text(drop_notice(dropped))
+            await send_text(queue.pop() or "")
 
 
 @ws_router.websocket("/ws/debugger/{session_id}")
@@ -27,10 +42,8 @@ async def debugger_stream(websocket: WebSocket, session_id: str) -> None:
         await websocket.close(code=4404)
         return
 
-    queue = session.debugger_queue
     try:
-        async for output in _consume_queue(queue):
-            await websocket.send_text(output or "")
+        await _pump_queue(websocket, session.debugger_queue, _debugger_drop_notice)
     except WebSocketDisconnect:
         return
 
@@ -44,9 +57,7 @@ async def chat_stream(websocket: WebSocket, session_id: str) -> None:
         await websocket.close(code=4404)
         return
 
-    queue = session.chat_queue
     try:
-        async for message in _consume_queue(queue):
-            await websocket.send_text(message or "")
+        await _pump_queue(websocket, session.chat_queue, _chat_drop_notice)
     except WebSocketDisconnect:
         return
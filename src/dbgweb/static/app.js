@@ -1281,6 +1281,13 @@ function connectWebSockets(id) {
           syncAutoApproveState(parsed);
           handled = true;
           break;
+        case "messages_dropped":
+          appendChatEntry(
+            "assistant",
+            `[chat] ${parsed.count} earlier message(s) dropped while the client was not keeping up`
+          );
+          handled = true;
+          break;
         case "command_proposal":
           if (parsed && parsed.command) {
             appendChatProposal(parsed);
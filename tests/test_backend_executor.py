@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dbgweb.app.services.session_manager import _BackendExecutor, _SessionWorker
+
+
+def test_lane_runs_jobs_in_fifo_order():
+    executor = _BackendExecutor(max_workers=4)
+    lane = _SessionWorker(executor)
+    done = []
+
+    def job(idx):
+        time.sleep(0.001 * (idx % 3))
+        done.append(idx)
+        return idx
+
+    async def main():
+        return await asyncio.gather(*(lane.call(job, idx) for idx in range(20)))
+
+    assert asyncio.run(main()) == list(range(20))
+    assert done == list(range(20))
+
+
+def test_executor_never_exceeds_max_workers():
+    executor = _BackendExecutor(max_workers=2)
+    lanes = [_SessionWorker(executor) for _ in range(6)]
+    lock = threading.Lock()
+    active = peak = 0
+
+    def job():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(lane.call(job) for lane in lanes for _ in range(2)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert executor._threads == 2
+
+
+def test_stopped_lane_refuses_new_calls():
+    lane = _SessionWorker(_BackendExecutor(max_workers=1))
+    lane.stop()
+
+    async def main():
+        lane.call(lambda: None)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
@@ -0,0 +1,99 @@
+import json
+
+from dbgagent.runner import AgentRequest, DebugAgentRunner
+
+
+def _runner(tmp_path, **overrides):
+    fields = dict(
+        debugger="gdb",
+        provider="mock-local",
+        model=None,
+        api_key=None,
+        program=None,
+        classpath=None,
+        sourcepath=None,
+        main_class=None,
+        corefile=None,
+        goal_type="crash",
+        goal_text="",
+        resume_context=None,
+        max_steps=3,
+        language="en",
+        log_enabled=False,
+        log_path=None,
+        report_path=tmp_path / "report.md",
+    )
+    fields.update(overrides)
+    return DebugAgentRunner(AgentRequest(**fields))
+
+
+def test_journals_are_readable_while_open_and_tagged_per_run(tmp_path):
+    first = _runner(tmp_path)
+    first._open_journals()
+    first._record_attempt("bt", "#0 main")
+    first._record_usage_stats("mock-local", {"prompt_tokens": 5})
+    # Readable before the run closes the files, as after a crash
+    path = tmp_path / "report.attempts.jsonl"
+    (record,) = [json.loads(line) for line in path.read_text().splitlines()]
+    assert record["cmd"] == "bt" and record["snippet"] == "#0 main"
+    assert record["session"] == first.state.session_id
+    assert isinstance(record["ts"], float)
+
+    second = _runner(tmp_path)
+    second._open_journals()
+    second._record_attempt("info frame", "")
+    for fp in (first._attempts_fp, first._usage_fp, second._attempts_fp, second._usage_fp):
+        fp.close()
+    sessions = [json.loads(line)["session"] for line in path.read_text().splitlines()]
+    assert sessions == [first.state.session_id, second.state.session_id]
+    (usage,) = [json.loads(line) for line in (tmp_path / "report.usage.jsonl").read_text().splitlines()]
+    assert usage["prompt_tokens"] == 5 and usage["session"] == first.state.session_id
+
+
+def test_large_resume_is_compacted_in_the_loop_not_evicted(tmp_path):
+    resume = "\n".join(f"line {idx}" for idx in range(300))
+    runner = _runner(tmp_path, resume_context=resume)
+    facts = runner.state.facts
+    assert facts[0] == "Prior session summary:"
+    assert len(facts) == 301
+
+    prompts = []
+
+    def fake_llm(prompt):
+        prompts.append(prompt)
+        return "summary of earlier lines" if len(prompts) == 1 else "Final Report: done"
+
+    runner._call_llm = fake_llm
+    runner._cached_prefix = ""
+    assert runner._auto_loop() == "Final Report: done"
+    # One summarization call folded the header and the oldest lines
+    assert "Prior session summary:" in prompts[0]
+    assert runner.state.facts_summary == "summary of earlier lines"
+    assert len(facts) < 128
+    assert facts[-1] == "  line 299"
+
+
+def test_report_counts_attempts_rotated_out(tmp_path):
+    runner = _runner(tmp_path)
+    for idx in range(130):
+        runner._record_attempt(f"cmd {idx}", "")
+    runner._write_report("done")
+    report = (tmp_path / "report.md").read_text()
+    assert "- (2 earlier commands not listed; all 130 are in report.attempts.jsonl)" in report
+    assert "`cmd 1`" not in report and "`cmd 2`" in report
+
+
+def test_extract_cmds_orders_indexed_and_skips_empty_tags(tmp_path):
+    runner = _runner(tmp_path)
+    reply = '<cmd index="2">info locals</cmd> <cmd>bt</cmd> <cmd> </cmd> <cmd index=1>info frame</cmd>'
+    # Unindexed tags count by position (bt is 2nd); ties keep reply order
+    assert runner._extract_cmds(reply, 3) == ["info frame", "info locals", "bt"]
+    assert runner._extract_cmds(reply, 2) == ["info frame", "info locals"]
+    assert runner._extract_cmds("no tags here", 3) == []
+
+
+def test_extract_cmds_single_uses_only_the_first_tag(tmp_path):
+    runner = _runner(tmp_path)
+    assert runner._extract_cmds("<cmd>bt</cmd><cmd>info locals</cmd>") == ["bt"]
+    # An empty first tag means no command, as before batching existed
+    assert runner._extract_cmds("<cmd></cmd><cmd>bt</cmd>") == []
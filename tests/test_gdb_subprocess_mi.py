@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+from dbgcopilot.backends.gdb_subprocess import GdbSubprocessBackend
+
+
+class _FakeChild:
+    """Stands in for the gdb Popen: canned MI bytes come out of a real pipe."""
+
+    def __init__(self):
+        r, self._w = os.pipe()
+        self.stdout = os.fdopen(r, "rb", buffering=0)
+        self.sent = []
+        child = self
+
+        class _Stdin:
+            def write(self, data):
+                child.sent.append(data)
+
+            def close(self):
+                pass
+
+        self.stdin = _Stdin()
+
+    def feed(self, *chunks, delay=0.0):
+        def write():
+            for chunk in chunks:
+                os.write(self._w, chunk)
+                if delay:
+                    time.sleep(delay)
+
+        if delay:
+            threading.Thread(target=write, daemon=True).start()
+        else:
+            write()
+
+    def poll(self):
+        return 0
+
+    def close(self):
+        os.close(self._w)
+        self.stdout.close()
+
+
+def _backend():
+    backend = GdbSubprocessBackend(timeout=2.0)
+    child = _FakeChild()
+    backend.child = child
+    return backend, child
+
+
+def test_done_result_returns_console_text():
+    backend, child = _backend()
+    child.feed(b'~"#0  main () at t.c:3\\n"\n1^done\n(gdb) \n')
+    assert backend.run_command("bt") == "#0  main () at t.c:3"
+    assert child.sent == [b'1-interpreter-exec console "bt"\n']
+    child.close()
+
+
+def test_resuming_command_waits_for_stopped():
+    backend, child = _backend()
+    child.feed(
+        b'1^running\n*running,thread-id="all"\n(gdb) \n'
+        b'=library-loaded,id="/lib/x"\n'
+        b'~"\\nBreakpoint 1, main () at t.c:3\\n"\n'
+        b'*stopped,reason="breakpoint-hit"\n(gdb) \n'
+    )
+    assert backend.run_command("continue") == "Breakpoint 1, main () at t.c:3"
+    child.close()
+
+
+def test_error_result_reports_message_once():
+    backend, child = _backend()
+    child.feed(
+        b'&"No symbol \\"foo\\" in current context.\\n"\n'
+        b'1^error,msg="No symbol \\"foo\\" in current context."\n(gdb) \n'
+        b'2^error,msg="Undefined command: \\"bar\\"."\n(gdb) \n'
+    )
+    assert backend.run_command("print foo") == 'No symbol "foo" in current context.'
+    # Without an & record the ^error message itself is surfaced
+    assert backend.run_command("bar") == 'Undefined command: "bar".'
+    child.close()
+
+
+def test_partial_reads_are_reassembled():
+    backend, child = _backend()
+    # Records split mid-line and mid UTF-8 sequence arrive over several reads
+    child.feed(
+        b'~"caf\\303',
+        b'\\251 one\\n"\n~"two',
+        b'\\n"\n1^do',
+        b"ne\n(gd",
+        b"b) \n",
+        delay=0.02,
+    )
+    pieces = list(backend.run_command_iter("info locals"))
+    assert "".join(pieces) == "caf\u00e9 one\ntwo"
+    assert len(pieces) > 1
+    child.close()
+
+
+def test_repeated_query_is_served_from_cache():
+    backend, child = _backend()
+    child.feed(b'~"#0  main ()\\n"\n1^done\n(gdb) \n')
+    assert backend.run_command("bt") == "#0  main ()"
+    assert backend.run_command("bt") == "#0  main ()"
+    assert len(child.sent) == 1
+    child.close()
+
+
+def test_stale_stopped_after_timeout_does_not_end_the_next_command():
+    backend, child = _backend()
+    child.feed(b'1^running\n*running,thread-id="all"\n(gdb) \n')
+    assert "[gdb timeout] continue" in backend.run_command("continue", timeout=0.2)
+    # The first continue's stop arrives late, ahead of the second one's records
+    child.feed(
+        b'*stopped,reason="breakpoint-hit"\n(gdb) \n'
+        b'2^running\n*running,thread-id="all"\n(gdb) \n'
+    )
+    assert "[gdb timeout] continue" in backend.run_command("continue", timeout=0.5)
+    child.close()
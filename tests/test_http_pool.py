@@ -0,0 +1,29 @@
+import threading
+
+import pytest
+
+pytest.importorskip("requests")
+
+from dbgcopilot.llm import http_pool
+
+
+def test_each_thread_gets_its_own_session_on_one_pool():
+    http_pool.close_session()
+    main = http_pool.get_session()
+    assert http_pool.get_session() is main
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(http_pool.get_session()))
+    worker.start()
+    worker.join()
+    (other,) = seen
+    assert other is not main
+    assert other.get_adapter("https://example.com") is main.get_adapter("https://example.com")
+
+    # Closing the pool hands out fresh sessions on a new adapter
+    old_adapter = main.get_adapter("https://example.com")
+    http_pool.close_session()
+    fresh = http_pool.get_session()
+    assert fresh is not main
+    assert fresh.get_adapter("https://example.com") is not old_adapter
+    http_pool.close_session()
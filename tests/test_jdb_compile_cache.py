@@ -0,0 +1,75 @@
+import os
+import stat
+import time
+
+from dbgcopilot.backends import java_jdb
+from dbgcopilot.backends.java_jdb import JavaJdbBackend
+
+_FAKE_JAVAC = """#!/usr/bin/env python3
+import os, sys
+args = sys.argv[1:]
+out, src = args[args.index("-d") + 1], args[-1]
+with open(os.path.join(os.path.dirname(__file__), "calls"), "a") as fh:
+    fh.write(src + "\\n")
+open(os.path.join(out, os.path.basename(src)[:-5] + ".class"), "w").write("cls")
+"""
+
+
+def _setup(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    javac = bindir / "javac"
+    javac.write_text(_FAKE_JAVAC)
+    javac.chmod(javac.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    src = tmp_path / "src" / "Main.java"
+    src.parent.mkdir()
+    src.write_text("class Main { public static void main(String[] a) {} }\n")
+    return src, bindir / "calls"
+
+
+def test_compiled_classes_lead_a_user_classpath(tmp_path, monkeypatch):
+    src, calls = _setup(tmp_path, monkeypatch)
+    cmd, _ = JavaJdbBackend(program=str(src), classpath="/opt/lib.jar")._prepare_launch()
+    cp = cmd[cmd.index("-classpath") + 1].split(os.pathsep)
+    assert cp[1] == "/opt/lib.jar"
+    assert (tmp_path / "cache" / "dbgcopilot" / "jdb").as_posix() in cp[0]
+    assert os.path.exists(os.path.join(cp[0], "Main.class"))
+    assert cmd[-1] == "Main"
+
+    # A second session reuses the entry without running javac again
+    JavaJdbBackend(program=str(src))._prepare_launch()
+    assert calls.read_text().count("Main.java") == 1
+
+
+def test_old_entries_are_pruned(tmp_path, monkeypatch):
+    src, _ = _setup(tmp_path, monkeypatch)
+    root = tmp_path / "cache" / "dbgcopilot" / "jdb"
+    stale = root / "stale"
+    stale.mkdir(parents=True)
+    (stale / "main-class").write_text("Old\n")
+    old = 1_000_000.0
+    os.utime(stale / "main-class", (old, old))
+    leftover = root / "abc.tmp-xyz"
+    leftover.mkdir()
+    os.utime(leftover, (old, old))
+
+    JavaJdbBackend(program=str(src))._prepare_launch()
+    assert not stale.exists()
+    assert not leftover.exists()
+    assert len(list(root.iterdir())) == 1
+
+
+def test_prune_keeps_the_most_recent_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(java_jdb, "_COMPILE_CACHE_MAX_ENTRIES", 3)
+    root = tmp_path / "jdb"
+    now = time.time()
+    for idx in range(5):
+        entry = root / f"e{idx}"
+        entry.mkdir(parents=True)
+        (entry / "main-class").write_text("M\n")
+        t = now - 100 + idx
+        os.utime(entry / "main-class", (t, t))
+    java_jdb._prune_compile_cache(root, root / "e0")
+    assert sorted(p.name for p in root.iterdir()) == ["e0", "e3", "e4"]
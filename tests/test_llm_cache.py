@@ -0,0 +1,78 @@
+def test_cached_call_serves_identical_prompts(tmp_path):
+    from dbgcopilot.llm.cache import ExactCache, cached_call
+
+    calls = []
+
+    def ask(prompt):
+        calls.append(prompt)
+        ask.last_usage = {"prompt_tokens": 12, "completion_tokens": 3}
+        return f"answer to {prompt}"
+
+    cache = ExactCache(tmp_path / "llm.db")
+    wrapped = cached_call(ask, cache, "mock-local", "m")
+
+    assert wrapped("bt?") == "answer to bt?"
+    assert wrapped.last_usage["prompt_tokens"] == 12
+    assert wrapped("bt?") == "answer to bt?"
+    assert wrapped.last_usage["cache_hit"] is True
+    assert wrapped.last_usage["prompt_tokens"] == 0
+    assert calls == ["bt?"]
+
+    # Different model -> different key
+    other = cached_call(ask, cache, "mock-local", "other")
+    other("bt?")
+    assert len(calls) == 2
+    cache.close()
+
+
+def test_cached_call_forwards_stream(tmp_path):
+    from dbgcopilot.llm.cache import ExactCache, cached_call
+
+    streamed = []
+
+    def ask(prompt):
+        raise AssertionError("stream should be used")
+
+    def stream(prompt):
+        streamed.append(prompt)
+        ask.last_usage = {"prompt_tokens": 7}
+        yield "<cmd>bt</cmd>"
+        yield " trailing text"
+
+    ask.stream = stream
+    cache = ExactCache(tmp_path / "llm.db")
+    wrapped = cached_call(ask, cache, "mock-local", "m")
+
+    # Miss: chunks pass through as they arrive; stopping early keeps what was read
+    chunks = wrapped.stream("bt?")
+    assert next(chunks) == "<cmd>bt</cmd>"
+    chunks.close()
+    assert wrapped.last_usage["prompt_tokens"] == 7
+
+    # Hit: the stored text comes back as one chunk without calling the provider
+    assert list(wrapped.stream("bt?")) == ["<cmd>bt</cmd>"]
+    assert wrapped.last_usage["cache_hit"] is True
+    assert streamed == ["bt?"]
+    cache.close()
+
+
+def test_cache_key_includes_session_config(tmp_path):
+    from dbgcopilot.llm.cache import ExactCache, cached_call
+
+    calls = []
+
+    def ask(prompt):
+        calls.append(prompt)
+        return "answer"
+
+    cache = ExactCache(tmp_path / "llm.db")
+    base = {"openai_http_temperature": "0", "openai_http_api_key": "k1"}
+    cached_call(ask, cache, "openai-http", "m", base)("bt?")
+    # Another API key alone still hits
+    cached_call(ask, cache, "openai-http", "m", {**base, "openai_http_api_key": "k2"})("bt?")
+    assert len(calls) == 1
+    # Any other setting change misses
+    cached_call(ask, cache, "openai-http", "m", {**base, "openai_http_temperature": "0.7"})("bt?")
+    cached_call(ask, cache, "openai-http", "m", {**base, "openai_http_base_url": "http://other"})("bt?")
+    assert len(calls) == 3
+    cache.close()
@@ -0,0 +1,38 @@
+from dbgcopilot.core import orchestrator
+from dbgcopilot.core.orchestrator import CopilotOrchestrator
+from dbgcopilot.core.state import SessionState
+
+
+class _Provider:
+    def __init__(self):
+        self.prompts = []
+
+    def create_client(self, _config):
+        return self.ask
+
+    def ask(self, prompt):
+        self.prompts.append(prompt)
+        return f"answer {len(self.prompts)}"
+
+
+def _orchestrator(monkeypatch):
+    provider = _Provider()
+    monkeypatch.setattr(orchestrator.providers, "get_provider", lambda _name: provider)
+    state = SessionState(session_id="s1", selected_provider="fake", colors_enabled=False)
+    return CopilotOrchestrator(backend=None, state=state), provider
+
+
+def test_immediate_repeat_reuses_the_answer(monkeypatch):
+    orch, provider = _orchestrator(monkeypatch)
+    assert orch.ask("why did it crash?") == "answer 1"
+    assert orch.ask("Why did it crash?") == "answer 1"
+    assert len(provider.prompts) == 1
+    assert orch.state.chatlog[-2:] == ["User: Why did it crash?", "Assistant: answer 1"]
+
+
+def test_repeat_after_other_turns_is_asked_again(monkeypatch):
+    orch, provider = _orchestrator(monkeypatch)
+    orch.ask("why did it crash?")
+    orch.ask("what is x?")
+    assert orch.ask("why did it crash?") == "answer 3"
+    assert len(provider.prompts) == 3
@@ -0,0 +1,51 @@
+from dbgcopilot.backends.query_cache import QueryCache, is_query
+
+
+def test_is_query_skips_commands_with_side_effects():
+    assert is_query("bt")
+    assert is_query("info registers")
+    assert is_query("x/4gx $sp")
+    assert is_query("output var")
+    # `print` records a new $N in value history on every call
+    assert not is_query("print var")
+    assert not is_query("p/x var")
+    # Bare `x` reads on from the last examined address
+    assert not is_query("x")
+    assert not is_query("x/4gx")
+    assert not is_query("output f()")
+    assert not is_query("output i = 3")
+    assert not is_query("continue")
+
+
+def test_state_change_invalidates_and_bumps_generation():
+    cache = QueryCache()
+    cache.store("bt", "#0 main")
+    assert cache.lookup("bt") == "#0 main"
+    gen = cache.generation
+    assert cache.lookup("next") is None
+    assert cache.generation == gen + 1
+    assert cache.lookup("bt") is None
+
+
+def test_store_ignores_results_from_an_older_generation():
+    cache = QueryCache()
+    assert cache.lookup("bt") is None
+    seen = cache.generation
+    cache.lookup("step")  # a later part of the same batch changes state
+    cache.store("bt", "#0 stale", seen)
+    assert cache.lookup("bt") is None
+    cache.store("bt", "#0 fresh", cache.generation)
+    assert cache.lookup("bt") == "#0 fresh"
+
+
+def test_non_queries_are_not_stored_and_lru_is_bounded():
+    cache = QueryCache(maxsize=2)
+    cache.store("print var", "$1 = 3")
+    assert cache.lookup("info frame") is None
+    cache.store("info frame", "f")
+    cache.store("info locals", "l")
+    cache.lookup("info frame")
+    cache.store("info args", "a")
+    assert cache.lookup("info locals") is None
+    assert cache.lookup("info frame") == "f"
+    assert cache.lookup("info args") == "a"
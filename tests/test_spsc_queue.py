@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from dbgweb.app.services.spsc_queue import SpscQueue
+
+
+def test_full_queue_drops_oldest_and_counts():
+    async def main():
+        q = SpscQueue(maxsize=3)
+        for idx in range(5):
+            q.put_nowait(idx)
+        assert [q.pop() for _ in range(len(q))] == [2, 3, 4]
+        assert q.take_dropped() == 2
+        assert q.take_dropped() == 0
+
+    asyncio.run(main())
+
+
+def test_pop_clears_the_ready_event():
+    async def main():
+        q = SpscQueue()
+        q.put_nowait("a")
+        await asyncio.wait_for(q.wait_nonempty(), 1)
+        assert q.pop() == "a"
+        # Empty again: the reader must block until the next put
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(q.wait_nonempty(), 0.05)
+        asyncio.get_running_loop().call_later(0.01, q.put_nowait, "b")
+        assert await asyncio.wait_for(q.get(), 1) == "b"
+        assert q.empty()
+
+    asyncio.run(main())